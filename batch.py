@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Parametria Batch Processor
+
+Headless entry point (parametria-batch) that applies an edit recipe to every
+image in a directory or glob pattern using a pool of worker processes.
+"""
+
+import argparse
+import sys
+from typing import List, Optional, Tuple
+from services.batch_processor import BatchProcessor, BatchItemResult
+from services.blur_engine import BLUR_METHODS
+from services.resize_engine import RESAMPLE_FILTERS, RESIZE_MODES
+from models.recipe import Recipe
+import config
+
+def parse_size(value: str) -> Tuple[int, int]:
+    """Parse a WIDTHxHEIGHT argument"""
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError("size must look like WIDTHxHEIGHT, e.g. 800x600")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError("width and height must be positive numbers")
+    return width, height
+
+def positive_int(value: str) -> int:
+    """Parse a count that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a whole number, got '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(
+        prog="parametria-batch",
+        description="Apply contrast, brightness, blur, grayscale and resize to many images."
+    )
+    parser.add_argument("inputs", nargs="+", help="input directories, files or glob patterns")
+    parser.add_argument("-o", "--output-dir", required=True, help="directory for processed images")
+    parser.add_argument("--recipe", metavar="FILE",
+                        help="JSON or TOML recipe saved from the editor; options below override it")
+    parser.add_argument("--contrast", type=float)
+    parser.add_argument("--brightness", type=float)
+    parser.add_argument("--blur", type=float)
+    parser.add_argument("--blur-method", choices=BLUR_METHODS,
+                        help="blur algorithm (default: BLUR_SETTINGS['export_method'])")
+    parser.add_argument("--grayscale", action="store_true", default=None, help="convert images to grayscale")
+    parser.add_argument("--resize", type=parse_size, metavar="WxH", help="resize to WIDTHxHEIGHT")
+    parser.add_argument("--resize-mode", choices=RESIZE_MODES,
+                        help="exact stretches, fit keeps the aspect ratio inside WxH, fill crops to cover it (default: exact)")
+    parser.add_argument("--resize-filter", choices=list(RESAMPLE_FILTERS),
+                        help="resampling filter (default: RESIZE_SETTINGS['filter'])")
+    parser.add_argument("-j", "--workers", type=positive_int, help="worker processes (default: CPU count)")
+    parser.add_argument("--format", dest="output_format", help="output extension, e.g. png or jpg")
+    parser.add_argument("--preset", choices=list(config.ENCODER_PRESETS),
+                        help="encoder preset, e.g. fast for quick exports (default: SAVE_SETTINGS['preset'])")
+    parser.add_argument("--suffix", dest="output_suffix", help="suffix appended to output file names")
+    parser.add_argument("--tiled", action="store_true",
+                        help="process in bands to bound memory for very large images (writes TIFF or PNG)")
+    parser.add_argument("--force", action="store_true",
+                        help="reprocess files even if their output is up to date")
+    parser.add_argument("--no-manifest", dest="manifest", action="store_false", default=None,
+                        help="do not read or write the output directory's manifest")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print the summary")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a batch job and return the process exit code"""
+    args = build_parser().parse_args(argv)
+    try:
+        recipe = Recipe.load(args.recipe) if args.recipe else {}
+    except (OSError, ValueError) as e:
+        print(f"Cannot read recipe {args.recipe}: {e}", file=sys.stderr)
+        return 2
+    for name in ('contrast', 'brightness', 'blur', 'blur_method', 'grayscale', 'resize',
+                 'resize_mode', 'resize_filter'):
+        value = getattr(args, name)
+        if value is not None:
+            recipe[name] = value
+    try:
+        recipe = Recipe.validate(recipe)
+    except ValueError as e:
+        print(f"Invalid settings: {e}", file=sys.stderr)
+        return 2
+    processor = BatchProcessor(
+        recipe,
+        args.output_dir,
+        workers=args.workers,
+        output_format=args.output_format,
+        output_suffix=args.output_suffix,
+        tiled=args.tiled,
+        encoder_preset=args.preset,
+        manifest=args.manifest
+    )
+
+    input_paths = processor.batch_inputs(args.inputs)
+    if not input_paths:
+        print("No images found.", file=sys.stderr)
+        return 1
+
+    def report_progress(result: BatchItemResult):
+        if args.quiet:
+            return
+        if result.skipped:
+            print(f"= {result.input_path} -> {result.output_path} (reused existing output)")
+        elif result.ok:
+            print(f"✓ {result.input_path} -> {result.output_path} ({result.seconds:.2f}s)")
+        else:
+            print(f"✗ {result.input_path}: {result.error}", file=sys.stderr)
+
+    report = processor.run(input_paths, progress_callback=report_progress, force=args.force)
+
+    print(f"\nProcessed {len(report.succeeded)}/{len(report.results)} images "
+          f"({len(report.skipped)} up to date) in {report.elapsed:.2f}s ({report.images_per_second:.2f} images/sec, "
+          f"{processor.workers} workers)")
+    if report.failed:
+        print(f"{len(report.failed)} failed:", file=sys.stderr)
+        for result in report.failed:
+            print(f"  {result.input_path}: {result.error}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Blur benchmark: speed and accuracy of the BlurEngine methods.
+
+For a display-sized proxy and a 12MP image at several radii, times each
+method and reports its PSNR against the exact Gaussian (or against the box
+method when numpy is missing and 'exact' cannot run). Higher PSNR is closer;
+above ~45 dB differences are invisible.
+
+Run from the repository root:
+    python -m benchmarks.bench_blur [--repeat N] [--json results.json]
+"""
+
+import argparse
+import json
+import sys
+from benchmarks.common import MEGAPIXEL_SIZES, make_test_image, psnr, time_call
+from services.blur_engine import BLUR_METHODS, BlurEngine
+import config
+
+SIZES = {
+    'proxy': config.MAX_IMAGE_SIZE,
+    '12MP': MEGAPIXEL_SIZES['12MP']
+}
+
+RADII = (1.0, 2.5, 5.0, 10.0)
+
+def _exact_available() -> bool:
+    try:
+        import numpy  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def run(repeat: int) -> dict:
+    """Time every method at every size and radius and score it against the reference"""
+    methods = [method for method in BLUR_METHODS if method != 'exact' or _exact_available()]
+    reference_method = 'exact' if 'exact' in methods else 'box'
+    results = {}
+    for label, size in SIZES.items():
+        image = make_test_image(size)
+        for radius in RADII:
+            reference = BlurEngine.blur(image, radius, reference_method)
+            key = f"{label}/r{radius:g}"
+            results[key] = {}
+            for method in methods:
+                timing = time_call(lambda: BlurEngine.blur(image, radius, method), repeat=repeat)
+                timing['psnr'] = psnr(reference, BlurEngine.blur(image, radius, method))
+                results[key][method] = timing
+    return {'reference': reference_method, 'results': results}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    print(f"PSNR reference: {results['reference']}")
+    for key, methods in results['results'].items():
+        row = "".join(
+            f"  {method} {timing['median'] * 1000:>8.1f}ms {timing['psnr']:>5.1f}dB"
+            for method, timing in methods.items()
+        )
+        print(f"{key:<12}{row}")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
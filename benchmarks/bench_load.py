@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Load-time benchmark: full decode versus decoder-level downscaling.
+
+Compares, for synthetic 12MP/24MP/50MP JPEGs:
+  * baseline - Image.open + thumbnail(MAX_IMAGE_SIZE), the editor's original open
+  * full     - decode at full resolution (full-resolution editing / export)
+  * resample - full decode followed by a plain resample to display size
+  * draft    - ImageOperations.load_image with max_size (draft + reduce)
+  * draft1.0 - the same with reducing_gap=1.0 (fastest, slightly softer)
+
+The speedup columns compare draft and draft1.0 with baseline. thumbnail()
+already drafts with Pillow's default reducing_gap of 2.0, so draft matches
+baseline in both output and time; the editor's gain is keeping only the
+display-sized image in memory, not a faster open.
+
+Run from the repository root:
+    python -m benchmarks.bench_load [--repeat N] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from PIL import Image
+from benchmarks.common import MEGAPIXEL_SIZES, make_test_image, time_call
+from services.image_operations import ImageOperations
+import config
+
+def load_baseline(path: str):
+    image = Image.open(path)
+    image.thumbnail(config.MAX_IMAGE_SIZE)
+    return image
+
+def load_full(path: str):
+    return ImageOperations.load_image(path)
+
+def load_resample(path: str):
+    image = ImageOperations.load_image(path)
+    image.thumbnail(config.MAX_IMAGE_SIZE, reducing_gap=None)
+    return image
+
+def load_draft(path: str):
+    return ImageOperations.load_image(path, config.MAX_IMAGE_SIZE)
+
+def load_draft_fast(path: str):
+    return ImageOperations.load_image(path, config.MAX_IMAGE_SIZE, reducing_gap=1.0)
+
+STRATEGIES = {
+    'baseline': load_baseline,
+    'full': load_full,
+    'resample': load_resample,
+    'draft': load_draft,
+    'draft1.0': load_draft_fast
+}
+
+def run(repeat: int) -> dict:
+    """Benchmark every strategy at every size and return the results"""
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for label, size in MEGAPIXEL_SIZES.items():
+            path = os.path.join(directory, f"{label}.jpg")
+            make_test_image(size).save(path, quality=90)
+            results[label] = {
+                name: time_call(lambda: strategy(path), repeat=repeat)
+                for name, strategy in STRATEGIES.items()
+            }
+    return results
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    print(f"{'size':<6}" + "".join(f"{name:>12}" for name in STRATEGIES) + f"{'draft':>8}{'draft1.0':>10}")
+    for label, timings in results.items():
+        row = "".join(f"{timings[name]['median'] * 1000:>10.1f}ms" for name in STRATEGIES)
+        speedups = [timings['baseline']['median'] / timings[name]['median'] for name in ('draft', 'draft1.0')]
+        print(f"{label:<6}{row}{speedups[0]:>7.2f}x{speedups[1]:>9.2f}x")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the ImageProcessor hot paths.
+
+Times load_image, apply_enhancements, create_display_image, resize_image,
+convert_to_grayscale and save_image on synthetic images of several sizes and
+modes (RGB, RGBA, L, P), writes the results as JSON and optionally compares
+them against a stored baseline, exiting non-zero when a case regresses.
+
+Run from the repository root:
+    python -m benchmarks.bench_processor --json results.json
+    python -m benchmarks.bench_processor --save-baseline benchmarks/baseline.json
+    python -m benchmarks.bench_processor --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import PIL
+from typing import Callable, Dict, List, Optional
+from benchmarks.common import make_test_image, time_call
+from services.image_operations import ImageOperations
+from services.image_processor import ImageProcessor
+import config
+
+SIZES = {
+    'small': (640, 480),
+    'medium': (1920, 1080),
+    'large': (4000, 3000)
+}
+
+MODES = ['RGB', 'RGBA', 'L', 'P']
+
+# Representative mid-range slider values, so no stage is skipped as a no-op
+ENHANCEMENTS = (1.3, 0.9, 2.0)
+
+def _save_format(mode: str) -> str:
+    return 'jpg' if mode in ('RGB', 'L') else 'png'
+
+def build_cases(display_available: bool) -> Dict[str, Callable]:
+    """
+    Map case names to factories: factory(image, work_dir) returns the call to time.
+
+    save_image is timed through ImageOperations because ImageProcessor.save_image
+    adds a success dialog around the same call.
+    """
+    def load_image(image, work_dir):
+        path = os.path.join(work_dir, f"load.{_save_format(image.mode)}")
+        image.save(path)
+        return lambda: ImageProcessor.load_image(path)
+
+    def save_image(image, work_dir):
+        path = os.path.join(work_dir, f"save.{_save_format(image.mode)}")
+        return lambda: ImageOperations.save_image(image, path)
+
+    cases = {
+        'load_image': load_image,
+        'apply_enhancements': lambda image, _: lambda: ImageProcessor.apply_enhancements(image, *ENHANCEMENTS),
+        'resize_image': lambda image, _: lambda: ImageProcessor.resize_image(
+            image, image.width // 2, image.height // 2
+        ),
+        'convert_to_grayscale': lambda image, _: lambda: ImageProcessor.convert_to_grayscale(image),
+        'save_image': save_image
+    }
+    if display_available:
+        cases['create_display_image'] = lambda image, _: lambda: ImageProcessor.create_display_image(image)
+    return cases
+
+def _open_display():
+    """Create a hidden Tk root for PhotoImage, or None when there is no display"""
+    try:
+        import tkinter
+        root = tkinter.Tk()
+        root.withdraw()
+        return root
+    except Exception:
+        return None
+
+def run(sizes: List[str], modes: List[str], case_names: Optional[List[str]], repeat: int) -> Dict:
+    """Run the selected cases and return a JSON-serializable result document"""
+    root = _open_display()
+    cases = build_cases(root is not None)
+    if case_names:
+        cases = {name: cases[name] for name in case_names if name in cases}
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size_name in sizes:
+            for mode in modes:
+                image = make_test_image(SIZES[size_name], mode)
+                for case_name, factory in cases.items():
+                    key = f"{case_name}/{mode}/{size_name}"
+                    results[key] = time_call(factory(image, work_dir), repeat=repeat)
+                    print(f"{key:<40} {results[key]['median'] * 1000:>9.2f} ms", flush=True)
+
+    if root is not None:
+        root.destroy()
+    return {
+        'metadata': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pillow': PIL.__version__,
+            'machine': platform.machine(),
+            'display_available': root is not None,
+            'repeat': repeat
+        },
+        'results': results
+    }
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return a description of every case whose median regressed beyond threshold"""
+    regressions = []
+    for key, timing in results['results'].items():
+        reference = baseline['results'].get(key)
+        if not reference:
+            continue
+        ratio = timing['median'] / reference['median']
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{key}: {reference['median'] * 1000:.2f} ms -> "
+                f"{timing['median'] * 1000:.2f} ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    settings = config.BENCHMARK_SETTINGS
+    parser = argparse.ArgumentParser(description="Benchmark the image-processing hot paths.")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--cases", nargs="+", help="only run these cases")
+    parser.add_argument("--repeat", type=int, default=settings['repeat'])
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    parser.add_argument("--save-baseline", help="write results as the new baseline")
+    parser.add_argument("--baseline", help="compare against this baseline file")
+    parser.add_argument("--threshold", type=float, default=settings['regression_threshold'],
+                        help="allowed slowdown before a case counts as a regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.modes, args.cases, args.repeat)
+    for path in (args.json_path, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (threshold {args.threshold:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: import cost and time to first frame.
+
+  * imports     - cumulative `python -X importtime` cost of each startup
+                  module, measured in a fresh interpreter, with the slowest
+                  modules it pulls in
+  * first_frame - wall time from launching main.py until the empty window is
+                  drawn (PARAMETRIA_STARTUP_REPORT milestone)
+  * ready       - wall time until the editor's widgets are drawn
+
+Wall times include interpreter start-up, which is what a user waits for.
+The window timings need customtkinter and a display; without them only the
+import costs of the headless modules are reported.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup [--repeat N] [--json results.json]
+    python -m benchmarks.bench_startup --save-baseline benchmarks/startup.json
+    python -m benchmarks.bench_startup --baseline benchmarks/startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+import config
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported at startup, from the window shell down to the headless core
+STARTUP_MODULES = [
+    'gui.main_window',
+    'gui.image_editor_gui',
+    'services.image_processor',
+    'models.image_model',
+    'services.image_operations'
+]
+
+def import_times(module: str) -> Dict[str, int]:
+    """Cumulative import time in microseconds of every module imported by `import module`"""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    times = {}
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+def measure_imports(repeat: int, top: int) -> Dict[str, Dict]:
+    """Median cumulative import time of each startup module and its slowest dependencies"""
+    results = {}
+    for module in STARTUP_MODULES:
+        try:
+            samples = [import_times(module) for _ in range(repeat)]
+        except RuntimeError as e:
+            results[module] = {'error': str(e)}
+            continue
+        median = statistics.median(sample[module] for sample in samples) / 1e6
+        heaviest = sorted(samples[-1].items(), key=lambda item: item[1], reverse=True)
+        results[module] = {
+            'median': median,
+            'heaviest': {name: micros / 1e6 for name, micros in heaviest[1:top + 1]}
+        }
+    return results
+
+def measure_window(repeat: int) -> Dict[str, Dict]:
+    """Median wall time from launching main.py to each startup milestone"""
+    environment = {**os.environ, 'PARAMETRIA_STARTUP_REPORT': '1'}
+    samples: Dict[str, List[float]] = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, 'main.py'], cwd=REPO_ROOT, env=environment,
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        for line in process.stdout:
+            if line.startswith('startup '):
+                samples.setdefault(line.split()[1], []).append(time.perf_counter() - start)
+        _, errors = process.communicate()
+        if process.returncode != 0:
+            message = errors.strip().splitlines()[-1] if errors.strip() else f"exit code {process.returncode}"
+            return {'error': message}
+    return {milestone: {'median': statistics.median(times), 'min': min(times)}
+            for milestone, times in samples.items()}
+
+def run(repeat: int, top: int) -> Dict:
+    return {
+        'python': sys.version.split()[0],
+        'imports': measure_imports(repeat, top),
+        'window': measure_window(repeat)
+    }
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return a description of every import or milestone whose median regressed beyond threshold"""
+    regressions = []
+    for section in ('imports', 'window'):
+        for key, timing in results[section].items():
+            reference = baseline.get(section, {}).get(key)
+            if not isinstance(timing, dict) or 'median' not in timing or not reference or 'median' not in reference:
+                continue
+            ratio = timing['median'] / reference['median']
+            if ratio > 1 + threshold:
+                regressions.append(
+                    f"{section}.{key}: {reference['median'] * 1000:.1f} ms -> "
+                    f"{timing['median'] * 1000:.1f} ms ({ratio:.2f}x)"
+                )
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    settings = config.BENCHMARK_SETTINGS
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=settings['repeat'])
+    parser.add_argument("--top", type=int, default=5, help="slowest dependencies listed per module")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    parser.add_argument("--save-baseline", help="write results as the new baseline")
+    parser.add_argument("--baseline", help="compare against this baseline file")
+    parser.add_argument("--threshold", type=float, default=settings['regression_threshold'],
+                        help="allowed slowdown before a timing counts as a regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat, args.top)
+    print("Import time (cumulative, median):")
+    for module, timing in results['imports'].items():
+        if 'error' in timing:
+            print(f"  {module:<28} unavailable: {timing['error']}")
+            continue
+        print(f"  {module:<28}{timing['median'] * 1000:>8.1f}ms")
+        for name, seconds in timing['heaviest'].items():
+            print(f"      {name:<36}{seconds * 1000:>8.1f}ms")
+    print("Window (wall time from launch, median):")
+    if 'error' in results['window']:
+        print(f"  unavailable: {results['window']['error']}")
+    for milestone, timing in results['window'].items():
+        if milestone != 'error':
+            print(f"  {milestone:<28}{timing['median'] * 1000:>8.1f}ms")
+
+    for path in (args.json_path, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (threshold {args.threshold:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+
+import math
+import statistics
+import time
+from PIL import Image, ImageChops, ImageDraw, ImageFilter
+from typing import Callable, Dict, Tuple
+
+# Typical camera sizes used across the load benchmarks
+MEGAPIXEL_SIZES = {
+    '12MP': (4000, 3000),
+    '24MP': (6000, 4000),
+    '50MP': (8660, 5773)
+}
+
+def make_test_image(size: Tuple[int, int], mode: str = 'RGB') -> Image.Image:
+    """Create a deterministic photo-like image (gradients plus soft shapes)"""
+    width, height = size
+    gradient = Image.linear_gradient('L').resize(size)
+    image = Image.merge('RGB', (
+        gradient,
+        gradient.transpose(Image.Transpose.ROTATE_180),
+        Image.radial_gradient('L').resize(size)
+    ))
+    draw = ImageDraw.Draw(image)
+    step = max(width, height) // 12
+    for index, x in enumerate(range(0, width, step)):
+        y = (index * 7919) % max(height - step, 1)
+        draw.ellipse((x, y, x + step, y + step), fill=(index * 37 % 256, 90, 200 - index % 200))
+    image = image.filter(ImageFilter.BoxBlur(2))
+    if mode == 'P':
+        return image.quantize(256)
+    return image.convert(mode)
+
+def time_call(fn: Callable[[], object], repeat: int = 5, warmup: int = 1) -> Dict[str, float]:
+    """Time fn and return min/median/mean wall time in seconds"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples)
+    }
+
+def psnr(reference: Image.Image, image: Image.Image) -> float:
+    """Peak signal-to-noise ratio in dB between two same-sized 8-bit images"""
+    histogram = ImageChops.difference(reference, image).histogram()
+    samples = reference.width * reference.height * len(reference.getbands())
+    mse = sum(count * (index % 256) ** 2 for index, count in enumerate(histogram)) / samples
+    return math.inf if mse == 0 else 10 * math.log10(255 ** 2 / mse)
@@ -5,6 +5,7 @@ Configuration settings for the Image Editor application
 # Application settings
 APP_TITLE = "Image Editor"
 DEFAULT_WINDOW_SIZE = (1200, 800)
+WINDOW_SCREEN_DIVISOR = 1.4   # window size is the primary monitor size divided by this
 
 # Image settings
 MAX_IMAGE_SIZE = (1460, 860)
@@ -21,9 +22,133 @@ SLIDER_RANGES = {
     'blur': {'from': 0.0, 'to': 5.0, 'steps': 50}
 }
 
+# Image loading settings
+LOAD_SETTINGS = {
+    'reducing_gap': 2.0,            # Decoder/reduce downscaling margin; lower is faster
+    'full_resolution_editing': False  # True keeps the full-size decode in memory while editing
+}
+
+# Resize engine (filters: 'nearest', 'bilinear', 'bicubic', 'lanczos')
+RESIZE_SETTINGS = {
+    'filter': 'lanczos',          # Resize edits, recipes and exports
+    'reducing_gap': 3.0,          # Box-reduce downscales to within this factor first; None filters the full source
+    'display_filter': 'bicubic',  # Fitting images to the window, proxy and thumbnails
+    'display_reducing_gap': 2.0
+}
+
+# Multi-core rendering of a single image
+PARALLEL_SETTINGS = {
+    'workers': None,          # Threads per image; None uses the CPU count
+    'min_pixels': 4_000_000   # Smaller images render on one thread
+}
+
+# Blur engine settings (methods: 'box', 'exact', 'downsample')
+BLUR_SETTINGS = {
+    'preview_method': 'downsample',  # Fast path for slider previews
+    'export_method': 'box',          # Pillow's GaussianBlur; 'exact' needs numpy
+    'downsample_min_radius': 1.0,    # Keep the reduced blur radius at least this large
+    'downsample_max_factor': 4
+}
+
+# Contrast/brightness lookup tables
+TONE_LUT_SETTINGS = {
+    'precompute': True,      # Build tables for every slider position when an image is loaded
+    'cached_tables': 4096    # 256-entry tables kept (400 slider combinations per image)
+}
+
+# Edit pipeline settings
+PIPELINE_SETTINGS = {
+    'cache_bytes': 128 * 1024 * 1024,         # Pixel bytes of cached preview results
+    'export_cache_bytes': 512 * 1024 * 1024,  # Pixel bytes of cached full-resolution results
+    'key_decimals': 4                         # Parameter rounding in cache keys
+}
+
+# Undo history settings
+HISTORY_SETTINGS = {
+    'budget_bytes': 256 * 1024 * 1024,  # Cap on compressed keyframe memory
+    'keyframe_interval': 4,             # Keep a keyframe every N destructive edits
+    'compression_level': 1              # zlib level; favour speed over ratio
+}
+
+# Live preview rendering settings
+RENDER_SETTINGS = {
+    'poll_interval_ms': 15,   # How often the Tk thread checks for finished frames
+    'fps_window': 1.0,        # Seconds of history used by the FPS counter
+    'show_fps': True
+}
+
+# Stage timing instrumentation (F12 toggles the overlay, Shift+F12 dumps a trace)
+PROFILING_SETTINGS = {
+    'enabled': False,          # Also enabled by the PARAMETRIA_PROFILE environment variable
+    'capacity': 10000,         # Records kept in the ring buffer
+    'dump_dir': '.',           # Where Shift+F12 writes the JSON and Chrome trace files
+    'overlay_window': 2.0,     # Seconds of records summarised by the overlay
+    'overlay_refresh_ms': 500
+}
+
+# Folder browser thumbnails
+THUMBNAIL_SETTINGS = {
+    'size': 128,               # Longest side in pixels (freedesktop "normal" size)
+    'cache_dir': None,         # None uses $XDG_CACHE_HOME/parametria/thumbnails
+    'workers': None,           # Generator threads; None uses the CPU count
+    'page_size': 120,          # Thumbnails shown (and held as Tk images) per page
+    'columns': 6,
+    'window_size': "900x700",
+    'poll_interval_ms': 50
+}
+
+# Next/previous navigation prefetching
+PREFETCH_SETTINGS = {
+    'neighbours': 2,                     # Images decoded ahead on each side of the current one
+    'budget_bytes': 256 * 1024 * 1024,   # Decoded pixel bytes kept for navigation
+    'workers': 2
+}
+
+# Decoded pixels kept on disk so reopening an image skips decoding
+PIXEL_CACHE_SETTINGS = {
+    'enabled': True,
+    'cache_dir': None,                   # None uses $XDG_CACHE_HOME/parametria/pixels
+    'budget_bytes': 512 * 1024 * 1024    # Shared by all editor instances using the directory
+}
+
+# Multi-size exports from one full-resolution render (sizes are longest sides in pixels)
+RENDITION_SETTINGS = {
+    'sizes': (2048, 1024, 512, 256),
+    'formats': ('jpg', 'webp', 'png'),
+    'filter': None,                        # None uses RESIZE_SETTINGS['filter']
+    'workers': None,                       # Encoder threads; None uses the CPU count
+    'name_pattern': '{stem}_{size}.{ext}'
+}
+
+# Batch processing settings
+BATCH_SETTINGS = {
+    'workers': None,          # None uses one process per CPU core
+    'output_suffix': '_edited',
+    'output_format': None,    # None keeps each input file's format
+    'cancel_poll_seconds': 0.1,
+    'start_method': None,     # multiprocessing start method; None uses the platform default
+    'gui_start_method': 'spawn',  # the editor has live threads, which fork would copy mid-lock
+    'manifest': True,         # skip inputs whose output is already up to date
+    'manifest_name': '.parametria-manifest.sqlite',  # created in the output directory
+    'manifest_timeout': 30.0  # seconds to wait for another writer's lock
+}
+
+# Benchmark settings
+BENCHMARK_SETTINGS = {
+    'repeat': 5,
+    'regression_threshold': 0.2   # Fail when a case is more than 20% slower than baseline
+}
+
+# Tiled (band-by-band) processing settings for images larger than memory
+TILED_SETTINGS = {
+    'band_height': 512,        # Rows processed per band, excluding blur/resize overlap
+    'full_decode': True,       # Decode sources that cannot be read in bands in full (with a warning) rather than fail
+    'png_compress_level': 6
+}
+
 # File dialog settings
 IMAGE_FILE_TYPES = [
-    ("Image files", "*.jpg *.jpeg *.png *.gif *.bmp *.tiff"),
+    ("Image files", "*.jpg *.jpeg *.png *.gif *.bmp *.tif *.tiff"),
     ("All files", "*.*")
 ]
 
@@ -31,9 +156,37 @@ SAVE_FILE_TYPES = [
     ("JPEG files", "*.jpg"),
     ("PNG files", "*.png"),
     ("BMP files", "*.bmp"),
+    ("WebP files", "*.webp"),
     ("All files", "*.*")
 ]
 
+RECIPE_FILE_TYPES = [
+    ("Recipe files", "*.json *.toml"),
+    ("JSON", "*.json"),
+    ("TOML", "*.toml")
+]
+
+# Encoder options per preset and Pillow format name; 'default' keeps Pillow's defaults
+ENCODER_PRESETS = {
+    'default': {},
+    'fast': {
+        'JPEG': {'quality': 85, 'subsampling': '4:2:0', 'optimize': False, 'progressive': False},
+        'PNG': {'compress_level': 1},
+        'WEBP': {'quality': 80, 'method': 0}
+    },
+    'best': {
+        'JPEG': {'quality': 95, 'subsampling': '4:4:4', 'optimize': True, 'progressive': True},
+        'PNG': {'compress_level': 9, 'optimize': True},
+        'WEBP': {'quality': 95, 'method': 6}
+    }
+}
+
+# Save settings
+SAVE_SETTINGS = {
+    'preset': 'default',       # Key of ENCODER_PRESETS selected when the editor starts
+    'poll_interval_ms': 50     # How often the Tk thread checks on a background save
+}
+
 # UI Layout settings
 FRAME_SETTINGS = {
     'picframe': {'width': 1500, 'height': 860, 'corner_radius': 10},
@@ -42,12 +195,20 @@ FRAME_SETTINGS = {
 
 # UI positioning (relative positions)
 BUTTON_POSITIONS = {
-    'open': (0.935, 0.09),
+    'open': (0.890, 0.09),
+    'open_folder': (0.980, 0.09),
     'grayscale': (0.935, 0.45),
-    'resize': (0.935, 0.50),
+    'resize': (0.890, 0.50),
+    'export_renditions': (0.980, 0.50),
     'save': (0.980, 0.55),
     'undo': (0.890, 0.55),
-    'reset': (0.935, 0.60)
+    'redo': (0.890, 0.60),
+    'reset': (0.980, 0.60),
+    'export_preset': (0.935, 0.70),
+    'previous': (0.890, 0.83),
+    'next': (0.980, 0.83),
+    'save_recipe': (0.890, 0.93),
+    'batch_apply': (0.980, 0.93)
 }
 
 SLIDER_POSITIONS = {
@@ -56,7 +217,11 @@ SLIDER_POSITIONS = {
     'brightness_label': (0.927, 0.25),
     'brightness_slider': (0.951, 0.30),
     'blur_label': (0.918, 0.35),
-    'blur_slider': (0.951, 0.40)
+    'blur_slider': (0.951, 0.40),
+    'fps_label': (0.935, 0.65),
+    'save_progress': (0.935, 0.75),
+    'save_status': (0.935, 0.78),
+    'navigation_label': (0.935, 0.88)
 }
 
 # Theme settings
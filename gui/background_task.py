@@ -0,0 +1,49 @@
+import threading
+from typing import Any, Callable, Optional
+import config
+
+class BackgroundTask:
+    """
+    Runs one long job at a time (e.g. a save) on a worker thread.
+
+    The result or error is handed back to the Tk main thread by a root.after
+    poll, so callbacks may touch widgets. Editing stays responsive meanwhile.
+    """
+
+    def __init__(self, root, poll_interval_ms: Optional[int] = None):
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms or config.SAVE_SETTINGS['poll_interval_ms']
+        self._thread: Optional[threading.Thread] = None
+        self._outcome = None
+
+    @property
+    def busy(self) -> bool:
+        return self._thread is not None
+
+    def run(self, job: Callable[[], Any], on_done: Callable[[Any], None],
+            on_error: Callable[[Exception], None]):
+        """Start job; on_done(result) or on_error(exception) runs on the Tk thread"""
+        if self.busy:
+            raise RuntimeError("A background task is already running")
+
+        def work():
+            try:
+                self._outcome = (job(), None)
+            except Exception as e:
+                self._outcome = (None, e)
+
+        self._outcome = None
+        self._thread = threading.Thread(target=work, name="background-task", daemon=True)
+        self._thread.start()
+        self.root.after(self.poll_interval_ms, lambda: self._poll(on_done, on_error))
+
+    def _poll(self, on_done: Callable[[Any], None], on_error: Callable[[Exception], None]):
+        if self._thread.is_alive():
+            self.root.after(self.poll_interval_ms, lambda: self._poll(on_done, on_error))
+            return
+        self._thread = None
+        result, error = self._outcome
+        if error is not None:
+            on_error(error)
+        else:
+            on_done(result)
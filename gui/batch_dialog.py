@@ -0,0 +1,121 @@
+import os
+import queue
+import threading
+import tkinter.messagebox
+import customtkinter as ctk
+from typing import Dict, List, Optional
+from gui.background_task import BackgroundTask
+from services.batch_processor import BatchItemResult, BatchProcessor, BatchReport
+import config
+
+class BatchDialog:
+    """
+    Window that applies a recipe to a selection of files and shows progress.
+
+    The batch runs on a BackgroundTask thread driving BatchProcessor's worker
+    processes; per-file results come back through a queue that a root.after
+    poll drains into the progress bar. Cancel stops the run after the files
+    already in progress, and the outputs written so far are kept.
+    """
+
+    def __init__(self, root: ctk.CTk):
+        self.root = root
+        self.window: Optional[ctk.CTkToplevel] = None
+        self.task = BackgroundTask(root)
+        self._results: 'queue.Queue[BatchItemResult]' = queue.Queue()
+        self._cancel = threading.Event()
+        self._total = 0
+        self._done = 0
+        self._failed = 0
+
+    @property
+    def busy(self) -> bool:
+        return self.task.busy
+
+    def start(self, recipe: Dict, input_paths: List[str], output_dir: str,
+              encoder_preset: Optional[str] = None):
+        """Open the progress window and process input_paths into output_dir"""
+        processor = BatchProcessor(recipe, output_dir, encoder_preset=encoder_preset,
+                                   start_method=config.BATCH_SETTINGS['gui_start_method'])
+        self._cancel.clear()
+        self._total = len(input_paths)
+        self._done = 0
+        self._failed = 0
+        self._create_window(output_dir)
+        self.task.run(
+            lambda: processor.run(input_paths, self._results.put, self._cancel),
+            self._finished,
+            self._failed_run
+        )
+        self.root.after(config.SAVE_SETTINGS['poll_interval_ms'], self._poll)
+
+    def _create_window(self, output_dir: str):
+        if self.window is None or not self.window.winfo_exists():
+            self.window = ctk.CTkToplevel(self.root)
+            self.window.geometry("420x160")
+            self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+            self.status_label = ctk.CTkLabel(self.window, text="")
+            self.status_label.pack(padx=10, pady=(15, 5))
+            self.progress = ctk.CTkProgressBar(self.window, mode="determinate")
+            self.progress.pack(fill="x", padx=20, pady=5)
+            self.cancel_button = ctk.CTkButton(self.window, text="Cancel", command=self.cancel)
+            self.cancel_button.pack(pady=10)
+        self.window.title(f"{config.APP_TITLE} - Batch to {output_dir}")
+        self.cancel_button.configure(text="Cancel", state="normal", command=self.cancel)
+        self.progress.set(0)
+        self._update_status()
+
+    def _update_status(self):
+        text = f"Processed {self._done} of {self._total} images"
+        if self._failed:
+            text += f" ({self._failed} failed)"
+        self.status_label.configure(text=text)
+
+    def _poll(self):
+        """Runs on the Tk main thread: move the progress bar for finished files"""
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._done += 1
+            self._failed += 0 if result.ok else 1
+        if self.window is not None and self.window.winfo_exists():
+            self.progress.set(self._done / self._total if self._total else 1)
+            self._update_status()
+        if self.task.busy:
+            self.root.after(config.SAVE_SETTINGS['poll_interval_ms'], self._poll)
+
+    def cancel(self):
+        """Stop after the files in progress, or close the window once the run is over"""
+        if not self.task.busy:
+            self.close()
+            return
+        self._cancel.set()
+        self.cancel_button.configure(state="disabled")
+        self.status_label.configure(text="Cancelling after the images in progress...")
+
+    def _finished(self, report: BatchReport):
+        self._poll()
+        outcome = "Cancelled" if report.cancelled else "Finished"
+        summary = (f"{outcome}: {len(report.succeeded)} of {self._total} images saved "
+                   f"({len(report.skipped)} already up to date) in {report.elapsed:.1f}s")
+        if report.failed:
+            failures = "\n".join(f"{os.path.basename(result.input_path)}: {result.error}"
+                                 for result in report.failed[:10])
+            tkinter.messagebox.showwarning("Batch Apply", f"{summary}\n{len(report.failed)} failed:\n{failures}")
+        self._show_outcome(summary)
+
+    def _failed_run(self, error: Exception):
+        self._show_outcome("Batch failed")
+        tkinter.messagebox.showerror("Error", f"Error applying recipe: {str(error)}")
+
+    def _show_outcome(self, text: str):
+        if self.window is not None and self.window.winfo_exists():
+            self.status_label.configure(text=text)
+            self.cancel_button.configure(text="Close", state="normal", command=self.close)
+
+    def close(self):
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
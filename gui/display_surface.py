@@ -0,0 +1,40 @@
+from PIL import Image, ImageTk
+from typing import Optional
+from services.image_operations import ImageOperations
+from utils.profiler import Profiler
+import config
+
+class DisplaySurface:
+    """
+    Shows images on a label through one persistent PhotoImage.
+
+    When a frame has the same size and mode as the previous one (every slider
+    preview of the same image), its pixels are pasted into the existing Tk photo in place:
+    no new Tk image is created, the label is not reconfigured and the previous
+    PhotoImage is not left for the garbage collector. Frames that already fit the
+    display are not copied before conversion.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.photo: Optional[ImageTk.PhotoImage] = None
+        self._key = None
+
+    def show(self, image: Image.Image) -> ImageTk.PhotoImage:
+        """Display image, reusing the current PhotoImage when the size matches"""
+        with Profiler.stage('display.thumbnail'):
+            image = ImageOperations.displayable(ImageOperations.fit_within(image, config.MAX_IMAGE_SIZE))
+        # The Tk photo keeps the mode it was created with, so a mode change (e.g.
+        # undoing grayscale) needs a new one just like a size change does
+        if self.photo is not None and (image.size, image.mode) == self._key:
+            with Profiler.stage('display.paste'):
+                self.photo.paste(image)
+            return self.photo
+
+        with Profiler.stage('display.photoimage'):
+            self.photo = ImageTk.PhotoImage(image)
+            self._key = (image.size, image.mode)
+        with Profiler.stage('tk.configure'):
+            self.label.configure(image=self.photo)
+            self.label.image = self.photo
+        return self.photo
@@ -0,0 +1,144 @@
+import os
+import queue
+import tkinter
+import customtkinter as ctk
+from PIL import Image, ImageTk
+from typing import Callable, Dict, List, Optional
+from services.batch_processor import BatchProcessor
+from services.thumbnail_cache import ThumbnailGenerator
+import config
+
+class FolderBrowser:
+    """
+    Window listing a folder's images as a page of thumbnails.
+
+    Thumbnails come from the on-disk ThumbnailCache and are generated on a
+    worker pool: the visible page first, then the rest of the folder so later
+    pages and later visits are instant. Only the current page holds Tk images,
+    which keeps memory flat for folders with thousands of files. Clicking a
+    thumbnail calls open_fn with the file path.
+    """
+
+    def __init__(self, root: ctk.CTk, open_fn: Callable[[str], None]):
+        self.root = root
+        self.open_fn = open_fn
+        self.window: Optional[ctk.CTkToplevel] = None
+        self.directory: Optional[str] = None
+        self.paths: List[str] = []
+        self.page = 0
+        self._results: 'queue.Queue' = queue.Queue()
+        self._generator: Optional[ThumbnailGenerator] = None
+        self._cells: Dict[str, tkinter.Label] = {}
+        self._photos: Dict[str, ImageTk.PhotoImage] = {}
+        self._polling = False
+
+    def show(self, directory: str):
+        """List directory and start generating its thumbnails"""
+        self.directory = directory
+        self.paths = BatchProcessor.collect_inputs([directory])
+        self.page = 0
+        if self._generator is not None:
+            self._generator.stop()
+        self._generator = ThumbnailGenerator(
+            lambda path, thumbnail, error: self._results.put((path, thumbnail, error))
+        )
+        self._ensure_window()
+        self.window.title(f"{config.APP_TITLE} - {directory}")
+        self._show_page()
+        # Fill the cache for the whole folder at low priority, behind the visible page
+        self._generator.request(self.paths, priority=1, deliver=False)
+
+    def page_paths(self) -> List[str]:
+        page_size = config.THUMBNAIL_SETTINGS['page_size']
+        return self.paths[self.page * page_size:(self.page + 1) * page_size]
+
+    def _ensure_window(self):
+        if self.window is not None and self.window.winfo_exists():
+            self.window.lift()
+            return
+        self.window = ctk.CTkToplevel(self.root)
+        self.window.geometry(config.THUMBNAIL_SETTINGS['window_size'])
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        toolbar = ctk.CTkFrame(self.window)
+        toolbar.pack(fill="x", padx=10, pady=(10, 0))
+        self.previous_button = ctk.CTkButton(toolbar, text="< Page", width=80,
+                                             command=lambda: self._change_page(-1))
+        self.previous_button.pack(side="left", padx=5, pady=5)
+        self.next_button = ctk.CTkButton(toolbar, text="Page >", width=80,
+                                         command=lambda: self._change_page(1))
+        self.next_button.pack(side="left", padx=5, pady=5)
+        self.page_label = ctk.CTkLabel(toolbar, text="")
+        self.page_label.pack(side="left", padx=10)
+
+        self.grid_frame = ctk.CTkScrollableFrame(self.window)
+        self.grid_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        size = config.THUMBNAIL_SETTINGS['size']
+        self._placeholder = ImageTk.PhotoImage(Image.new('RGB', (size, size), (51, 51, 51)))
+
+    def _change_page(self, step: int):
+        page_size = config.THUMBNAIL_SETTINGS['page_size']
+        last_page = max(0, (len(self.paths) - 1) // page_size)
+        page = min(max(self.page + step, 0), last_page)
+        if page != self.page:
+            self.page = page
+            self._show_page()
+
+    def _show_page(self):
+        """Lay out empty cells for the current page and ask for their thumbnails"""
+        for cell in self._cells.values():
+            cell.destroy()
+        self._cells.clear()
+        self._photos.clear()
+
+        settings = config.THUMBNAIL_SETTINGS
+        paths = self.page_paths()
+        for index, path in enumerate(paths):
+            cell = tkinter.Label(self.grid_frame, text=os.path.basename(path)[:18], compound="top",
+                                 image=self._placeholder, bg="gray20", fg="white", cursor="hand2")
+            cell.grid(row=index // settings['columns'], column=index % settings['columns'], padx=4, pady=4)
+            cell.bind("<Button-1>", lambda event, path=path: self.open_fn(path))
+            self._cells[path] = cell
+
+        first = self.page * settings['page_size']
+        self.page_label.configure(
+            text=f"{first + 1 if paths else 0}-{first + len(paths)} of {len(self.paths)} images"
+        )
+        # Already generated thumbnails come straight back from the disk cache
+        self._generator.request(paths, priority=0)
+        self._ensure_polling()
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(config.THUMBNAIL_SETTINGS['poll_interval_ms'], self._poll)
+
+    def _poll(self):
+        """Runs on the Tk main thread: show finished thumbnails that are on this page"""
+        self._polling = False
+        if self.window is None or not self.window.winfo_exists():
+            return
+        while True:
+            try:
+                path, thumbnail, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            cell = self._cells.get(path)
+            if cell is None:
+                continue
+            if error is not None:
+                cell.configure(text=f"{os.path.basename(path)[:18]}\n(unreadable)")
+                continue
+            photo = ImageTk.PhotoImage(thumbnail)
+            self._photos[path] = photo
+            cell.configure(image=photo)
+        self._ensure_polling()
+
+    def close(self):
+        if self._generator is not None:
+            self._generator.stop()
+            self._generator = None
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
@@ -1,7 +1,16 @@
+import os
 import customtkinter as ctk
 import tkinter.messagebox
 from models.image_model import ImageModel
+from services.image_operations import ImageOperations
 from services.image_processor import ImageProcessor
+from services.batch_processor import BatchProcessor
+from services.pixel_cache import PixelCache
+from services.prefetcher import ImagePrefetcher
+from gui.background_task import BackgroundTask
+from gui.display_surface import DisplaySurface
+from utils.profiler import Profiler
+from gui.render_scheduler import RenderScheduler
 import config
 
 class ImageEditorGUI:
@@ -13,35 +22,75 @@ class ImageEditorGUI:
         self.toolsframe = toolsframe
         self.image_model = ImageModel()
         self.image_processor = ImageProcessor()
+        self.render_scheduler = RenderScheduler(
+            self.root, self._render_preview, self._show_preview, self._preview_failed
+        )
+        self.save_task = BackgroundTask(self.root)
+        # Created on first use, which keeps their imports off the startup path
+        self._folder_browser = None
+        self._batch_dialog = None
+        self.pixel_cache = PixelCache() if config.PIXEL_CACHE_SETTINGS['enabled'] else None
+        self.prefetcher = ImagePrefetcher(self._decode_for_editing)
+        self.folder_paths = []
+        self.folder_index = -1
         
         self._create_widgets()
+        self._bind_profiling_keys()
     
     def _create_widgets(self):
         """Create all GUI widgets"""
         # Image display label
         self.img_label_edited = ctk.CTkLabel(self.picframe, text="‎")
         self.img_label_edited.place(relx=0.5, rely=0.5, anchor="center")
+        self.display_surface = DisplaySurface(self.img_label_edited)
         
         # Buttons
         positions = config.BUTTON_POSITIONS
         self.open_button = ctk.CTkButton(self.root, text="Open Image", command=self.open_image)
         self.open_button.place(relx=positions['open'][0], rely=positions['open'][1], anchor="ne")
         
+        self.open_folder_button = ctk.CTkButton(self.root, text="Open Folder", command=self.open_folder)
+        self.open_folder_button.place(relx=positions['open_folder'][0], rely=positions['open_folder'][1], anchor="ne")
+        
         self.grayscale_button = ctk.CTkButton(self.root, text="Grayscale", command=self.grayscale_image)
         self.grayscale_button.place(relx=positions['grayscale'][0], rely=positions['grayscale'][1], anchor="ne")
         
         self.resize_button = ctk.CTkButton(self.root, text="Resize Image", command=self.resize_image)
         self.resize_button.place(relx=positions['resize'][0], rely=positions['resize'][1], anchor="ne")
         
+        self.renditions_button = ctk.CTkButton(self.root, text="Export Renditions", command=self.export_renditions)
+        self.renditions_button.place(relx=positions['export_renditions'][0], rely=positions['export_renditions'][1], anchor="ne")
+        
         self.save_button = ctk.CTkButton(self.root, text="Save Image", command=self.save_image)
         self.save_button.place(relx=positions['save'][0], rely=positions['save'][1], anchor="ne")
         
         self.undo_button = ctk.CTkButton(self.root, text="Undo", command=self.undo_changes)
         self.undo_button.place(relx=positions['undo'][0], rely=positions['undo'][1], anchor="ne")
         
+        self.redo_button = ctk.CTkButton(self.root, text="Redo", command=self.redo_changes)
+        self.redo_button.place(relx=positions['redo'][0], rely=positions['redo'][1], anchor="ne")
+        
         self.reset_button = ctk.CTkButton(self.root, text="Reset Image", command=self.reset_image)
         self.reset_button.place(relx=positions['reset'][0], rely=positions['reset'][1], anchor="ne")
         
+        self.previous_button = ctk.CTkButton(self.root, text="< Previous", command=lambda: self.show_adjacent(-1))
+        self.previous_button.place(relx=positions['previous'][0], rely=positions['previous'][1], anchor="ne")
+        
+        self.next_button = ctk.CTkButton(self.root, text="Next >", command=lambda: self.show_adjacent(1))
+        self.next_button.place(relx=positions['next'][0], rely=positions['next'][1], anchor="ne")
+        self.root.bind("<Prior>", lambda event: self.show_adjacent(-1))
+        self.root.bind("<Next>", lambda event: self.show_adjacent(1))
+        
+        self.save_recipe_button = ctk.CTkButton(self.root, text="Save Recipe", command=self.save_recipe)
+        self.save_recipe_button.place(relx=positions['save_recipe'][0], rely=positions['save_recipe'][1], anchor="ne")
+        
+        self.batch_apply_button = ctk.CTkButton(self.root, text="Batch Apply", command=self.batch_apply)
+        self.batch_apply_button.place(relx=positions['batch_apply'][0], rely=positions['batch_apply'][1], anchor="ne")
+        
+        self.preset_menu = ctk.CTkOptionMenu(self.root, values=list(config.ENCODER_PRESETS))
+        self.preset_menu.set(config.SAVE_SETTINGS['preset'])
+        self.preset_menu.place(relx=positions['export_preset'][0], rely=positions['export_preset'][1], anchor="ne")
+        
         # Sliders and labels
         slider_pos = config.SLIDER_POSITIONS
         slider_ranges = config.SLIDER_RANGES
@@ -55,7 +104,8 @@ class ImageEditorGUI:
             from_=slider_ranges['contrast']['from'], 
             to=slider_ranges['contrast']['to'], 
             number_of_steps=slider_ranges['contrast']['steps'], 
-            orientation="horizontal"
+            orientation="horizontal",
+            command=self.adjust_contrast
         )
         self.contrast_slider.set(defaults['contrast'])
         self.contrast_slider.bind("<ButtonRelease-1>", self.slider_released)
@@ -69,7 +119,8 @@ class ImageEditorGUI:
             from_=slider_ranges['brightness']['from'], 
             to=slider_ranges['brightness']['to'], 
             number_of_steps=slider_ranges['brightness']['steps'], 
-            orientation="horizontal"
+            orientation="horizontal",
+            command=self.adjust_brightness
         )
         self.brightness_slider.set(defaults['brightness'])
         self.brightness_slider.bind("<ButtonRelease-1>", self.slider_released)
@@ -83,11 +134,61 @@ class ImageEditorGUI:
             from_=slider_ranges['blur']['from'], 
             to=slider_ranges['blur']['to'], 
             number_of_steps=slider_ranges['blur']['steps'], 
-            orientation="horizontal"
+            orientation="horizontal",
+            command=self.adjust_blur
         )
         self.blur_slider.set(defaults['blur'])
         self.blur_slider.bind("<ButtonRelease-1>", self.slider_released)
         self.blur_slider.place(relx=slider_pos['blur_slider'][0], rely=slider_pos['blur_slider'][1], anchor="ne")
+        
+        self.fps_label = ctk.CTkLabel(self.root, text="")
+        if config.RENDER_SETTINGS['show_fps']:
+            self.fps_label.place(relx=slider_pos['fps_label'][0], rely=slider_pos['fps_label'][1], anchor="ne")
+        
+        self.navigation_label = ctk.CTkLabel(self.root, text="")
+        self.navigation_label.place(relx=slider_pos['navigation_label'][0], rely=slider_pos['navigation_label'][1], anchor="ne")
+        
+        # Shown while a save runs in the background
+        self.save_progress = ctk.CTkProgressBar(self.root, mode="indeterminate")
+        self.save_status_label = ctk.CTkLabel(self.root, text="")
+        self.save_status_label.place(relx=slider_pos['save_status'][0], rely=slider_pos['save_status'][1], anchor="ne")
+    
+    def _bind_profiling_keys(self):
+        """F12 toggles the stage timing overlay, Shift+F12 dumps the recorded stages"""
+        self.profile_overlay = ctk.CTkLabel(self.picframe, text="", justify="left", anchor="nw",
+                                            font=("Courier", 12))
+        self.root.bind("<F12>", lambda event: self.toggle_profile_overlay())
+        self.root.bind("<Shift-F12>", lambda event: self.dump_profile())
+    
+    def toggle_profile_overlay(self):
+        """Show or hide per-stage timings; showing the overlay turns profiling on"""
+        if self.profile_overlay.winfo_ismapped():
+            self.profile_overlay.place_forget()
+            Profiler.set_enabled(self._profiling_before_overlay)
+            return
+        self._profiling_before_overlay = Profiler.enabled()
+        Profiler.set_enabled(True)
+        self.profile_overlay.place(relx=0.01, rely=0.01, anchor="nw")
+        self._refresh_profile_overlay()
+    
+    def _refresh_profile_overlay(self):
+        if not self.profile_overlay.winfo_ismapped():
+            return
+        settings = config.PROFILING_SETTINGS
+        lines = [f"{'stage':<34}{'n':>4}{'mean ms':>9}{'max ms':>9}"]
+        stages = Profiler.summary(settings['overlay_window'])
+        for name, stats in sorted(stages.items(), key=lambda item: -item[1]['total']):
+            lines.append(f"{name:<34}{stats['count']:>4}{stats['mean'] * 1000:>9.1f}{stats['max'] * 1000:>9.1f}")
+        self.profile_overlay.configure(text="\n".join(lines))
+        self.root.after(settings['overlay_refresh_ms'], self._refresh_profile_overlay)
+    
+    def dump_profile(self):
+        """Write recorded stages as JSON and as a Chrome trace"""
+        try:
+            paths = Profiler.dump()
+            tkinter.messagebox.showinfo("Profile", "Stage timings written to:\n" + "\n".join(paths))
+        except Exception as e:
+            tkinter.messagebox.showerror("Error", f"Error writing profile: {str(e)}")
     
     def _reset_sliders_to_defaults(self):
         """Reset all sliders to their default values"""
@@ -107,101 +208,309 @@ class ImageEditorGUI:
     def open_image(self):
         file_path = self.image_processor.open_image_dialog()
         if file_path:
-            image = self.image_processor.load_image(file_path)
-            if image:
-                self.image_model.set_original_image(image)
-                self._reset_sliders_to_defaults()
-                self.update_image()
+            self.open_path(file_path)
+
+    @property
+    def folder_browser(self):
+        if self._folder_browser is None:
+            from gui.folder_browser import FolderBrowser
+            self._folder_browser = FolderBrowser(self.root, self.open_path)
+        return self._folder_browser
+    
+    @property
+    def batch_dialog(self):
+        if self._batch_dialog is None:
+            from gui.batch_dialog import BatchDialog
+            self._batch_dialog = BatchDialog(self.root)
+        return self._batch_dialog
 
+    def open_folder(self):
+        directory = self.image_processor.open_folder_dialog()
+        if directory:
+            try:
+                self.folder_browser.show(directory)
+            except Exception as e:
+                tkinter.messagebox.showerror("Error", f"Error opening folder: {str(e)}")
+
+    def open_path(self, file_path: str):
+        """Open an image file in the editor"""
+        if not file_path:
+            return
+        try:
+            # Usually already decoded by the prefetcher when stepping through a folder
+            with Profiler.stage('open.decode'):
+                image = self.prefetcher.get(file_path)
+        except Exception as e:
+            tkinter.messagebox.showerror("Error", f"Error opening image: {str(e)}")
+            return
+        # Display-size decodes re-read the full-resolution file on save
+        source_path = None if config.LOAD_SETTINGS['full_resolution_editing'] else file_path
+        self.image_model.set_original_image(image, source_path)
+        self._reset_sliders_to_defaults()
+        self.update_image()
+        self._update_navigation(file_path)
+
+    def _decode_for_editing(self, file_path: str):
+        """Decode a file the way the editor opens it, or map it from the pixel cache; runs on prefetch threads"""
+        max_size = None if config.LOAD_SETTINGS['full_resolution_editing'] else config.MAX_IMAGE_SIZE
+        if self.pixel_cache is None:
+            return ImageOperations.load_image(file_path, max_size)
+        return self.pixel_cache.load(file_path, max_size, ImageOperations.load_image)
+
+    def _update_navigation(self, file_path: str):
+        """Locate file_path in its folder and prefetch the images around it"""
+        file_path = os.path.abspath(file_path)
+        if file_path not in self.folder_paths:
+            directory = os.path.dirname(file_path)
+            self.folder_paths = [os.path.abspath(path) for path in BatchProcessor.collect_inputs([directory])]
+        if file_path not in self.folder_paths:
+            self.folder_paths, self.folder_index = [], -1
+            self.navigation_label.configure(text="")
+            return
+        self.folder_index = self.folder_paths.index(file_path)
+        self.prefetcher.prefetch(ImagePrefetcher.neighbours(
+            self.folder_paths, self.folder_index, config.PREFETCH_SETTINGS['neighbours']
+        ))
+        stats = self.prefetcher.stats()
+        self.navigation_label.configure(
+            text=f"{self.folder_index + 1} / {len(self.folder_paths)}   "
+                 f"prefetch hits {stats['hit_rate']:.0%}"
+        )
+
+    def show_adjacent(self, step: int):
+        """Open the next (step=1) or previous (step=-1) image in the current folder"""
+        if self.folder_index < 0:
+            return
+        index = self.folder_index + step
+        if 0 <= index < len(self.folder_paths):
+            self.open_path(self.folder_paths[index])
+
+    @Profiler.timed('ImageEditorGUI.update_image')
     def update_image(self):
         if self.image_model.has_image():
+            # A synchronous render supersedes any drag preview still in flight
+            self.render_scheduler.cancel()
             try:
                 contrast_value, brightness_value, blur_value = self._get_current_slider_values()
                 
-                # Always start from the original image to avoid cumulative effects
-                temp_image = self.image_model.enhanced_image.copy()
-                temp_image = self.image_processor.apply_enhancements(temp_image, contrast_value, brightness_value, blur_value)
+                # Render the preview on the display-sized proxy, not the full-resolution image
+                temp_image = self.image_model.render_preview(contrast_value, brightness_value, blur_value)
                 
-                # Create a copy for display
-                display_image = self.image_processor.create_display_image(temp_image)
-                if display_image:
-                    self.image_model.set_display_image(display_image)
-                    self.img_label_edited.configure(image=display_image)
-                    self.img_label_edited.image = display_image
+                # Paste into the label's persistent PhotoImage
+                self.image_model.set_display_image(self.display_surface.show(temp_image))
             except Exception as e:
                 tkinter.messagebox.showerror("Error", f"Error updating image: {str(e)}")
  
     def slider_released(self, event):
+        if not self.image_model.has_image():
+            return
         try:
-            # Apply the current slider values to create the new enhanced image
+            # Slider values are applied on top of the enhanced image; the full-resolution
+            # render is deferred until the image is saved
             contrast_value, brightness_value, blur_value = self._get_current_slider_values()
-            
-            # Start from original and apply all effects
-            temp_image = self.image_processor.apply_enhancements(
-                self.image_model.original_image, 
-                contrast_value, 
-                brightness_value, 
-                blur_value
-            )
-            
-            self.image_model.set_enhanced_image(temp_image)
             self.update_image()
-            self.image_model.add_to_undo_stack(temp_image, contrast_value, brightness_value, blur_value)
+            self.image_model.record_adjustment(contrast_value, brightness_value, blur_value)
         except Exception as e:
             tkinter.messagebox.showerror("Error", f"Error applying changes: {str(e)}")
 
     def adjust_contrast(self, value=None):
         if self.image_model.has_image():
-            self.update_image()
+            self.request_preview()
 
     def adjust_brightness(self, value=None):
         if self.image_model.has_image():
-            self.update_image()
+            self.request_preview()
 
     def adjust_blur(self, value=None):
         if self.image_model.has_image():
-            self.update_image()
+            self.request_preview()
+
+    def request_preview(self):
+        """Queue a background preview render for the current slider values"""
+        self.render_scheduler.submit(self._get_current_slider_values())
+
+    @Profiler.timed('ImageEditorGUI.render_preview')
+    def _render_preview(self, slider_values):
+        """Render a preview frame; runs on the scheduler's worker thread"""
+        return self.image_model.render_preview(*slider_values)
+
+    def _show_preview(self, image):
+        """Display a finished preview frame; runs on the Tk main thread"""
+        try:
+            self.image_model.set_display_image(self.display_surface.show(image))
+        except Exception as e:
+            self._preview_failed(e)
+            return
+        if config.RENDER_SETTINGS['show_fps']:
+            self.fps_label.configure(text=f"Preview: {self.render_scheduler.fps:.1f} fps")
+
+    def _preview_failed(self, error: Exception):
+        """Drag previews fail silently; the render on release reports the error"""
+        self.fps_label.configure(text="Preview failed")
 
     def undo_changes(self):
         try:
+            # At the bottom of the history there is nothing to undo; the redo
+            # stack is kept, and only Ctrl+R resets to the original
             previous_state = self.image_model.undo_last_change()
             if previous_state:
-                enhanced_image, contrast_value, brightness_value, blur_value = previous_state
-                self.image_model.set_enhanced_image(enhanced_image)
-                
-                # Update sliders to match the previous state
-                self.contrast_slider.set(contrast_value)
-                self.brightness_slider.set(brightness_value)
-                self.blur_slider.set(blur_value)
-                
-                # Update the display
-                self.update_image()
-            elif self.image_model.has_image():
-                # Reset to original image
-                self.image_model.reset_to_original()
-                self._reset_sliders_to_defaults()
-                self.update_image()
+                self._restore_state(previous_state)
         except Exception as e:
             tkinter.messagebox.showerror("Error", f"Error undoing changes: {str(e)}")
 
+    def redo_changes(self):
+        try:
+            next_state = self.image_model.redo_last_change()
+            if next_state:
+                self._restore_state(next_state)
+        except Exception as e:
+            tkinter.messagebox.showerror("Error", f"Error redoing changes: {str(e)}")
+
+    def _restore_state(self, state):
+        """Move the sliders to a history state and refresh the display"""
+        _, contrast_value, brightness_value, blur_value = state
+        self.contrast_slider.set(contrast_value)
+        self.brightness_slider.set(brightness_value)
+        self.blur_slider.set(blur_value)
+        self.update_image()
+
     def save_image(self):
-        if self.image_model.has_enhanced_image():
-            file_path = self.image_processor.save_image_dialog()
-            if file_path:
-                # Apply current slider settings to get the final image
-                contrast_value, brightness_value, blur_value = self._get_current_slider_values()
-                
-                # Create final image with all effects
-                final_image = self.image_processor.apply_enhancements(
-                    self.image_model.enhanced_image,
-                    contrast_value,
-                    brightness_value,
-                    blur_value
-                )
-                
-                self.image_processor.save_image(final_image, file_path)
-        else:
+        if not self.image_model.has_enhanced_image():
             tkinter.messagebox.showwarning("Warning", "No image to save. Please open an image first.")
+            return
+        if self.save_task.busy:
+            tkinter.messagebox.showinfo("Save Image", "A save is already in progress.")
+            return
+        
+        file_path = self.image_processor.save_image_dialog()
+        if not file_path:
+            return
+        
+        try:
+            # Capture the current edit; rendering and encoding run in the background
+            contrast_value, brightness_value, blur_value = self._get_current_slider_values()
+            render = self.image_model.export_renderer(contrast_value, brightness_value, blur_value)
+            save_options = ImageOperations.encoder_options(file_path, self.preset_menu.get())
+        except Exception as e:
+            tkinter.messagebox.showerror("Error", f"Error preparing save: {str(e)}")
+            return
+        
+        self._begin_save(f"Saving {os.path.basename(file_path)}...")
+        self.save_task.run(
+            lambda: self.image_processor.render_and_save(render, file_path, **save_options),
+            self._save_finished,
+            self._save_failed
+        )
+    
+    def export_renditions(self):
+        """Render the edit once and write it at every RENDITION_SETTINGS size and format"""
+        if not self.image_model.has_enhanced_image():
+            tkinter.messagebox.showwarning("Warning", "No image to export. Please open an image first.")
+            return
+        if self.save_task.busy:
+            tkinter.messagebox.showinfo("Export Renditions", "A save is already in progress.")
+            return
+        
+        output_dir = self.image_processor.open_folder_dialog("Select Renditions Folder")
+        if not output_dir:
+            return
+        
+        try:
+            from services.rendition_export import RenditionExporter
+            contrast_value, brightness_value, blur_value = self._get_current_slider_values()
+            render = self.image_model.export_renderer(contrast_value, brightness_value, blur_value)
+            exporter = RenditionExporter(encoder_preset=self.preset_menu.get())
+        except Exception as e:
+            tkinter.messagebox.showerror("Error", f"Error preparing export: {str(e)}")
+            return
+        source = self.folder_paths[self.folder_index] if self.folder_index >= 0 else "image"
+        stem = os.path.splitext(os.path.basename(source))[0]
+        
+        self._begin_save(f"Exporting renditions of {stem}...")
+        self.save_task.run(
+            lambda: self.image_processor.render_and_export_renditions(render, exporter, output_dir, stem),
+            self._renditions_finished,
+            self._save_failed
+        )
+    
+    def _begin_save(self, status: str):
+        self.save_button.configure(state="disabled")
+        self.renditions_button.configure(state="disabled")
+        slider_pos = config.SLIDER_POSITIONS
+        self.save_progress.place(relx=slider_pos['save_progress'][0], rely=slider_pos['save_progress'][1], anchor="ne")
+        self.save_progress.start()
+        self.save_status_label.configure(text=status)
+    
+    def _end_save(self):
+        self.save_progress.stop()
+        self.save_progress.place_forget()
+        self.save_button.configure(state="normal")
+        self.renditions_button.configure(state="normal")
+    
+    def _save_finished(self, outcome):
+        """Report render and encode time and the file size; runs on the Tk main thread"""
+        self._end_save()
+        render_seconds, result = outcome
+        summary = (f"{os.path.basename(result.file_path)}: {result.file_size / (1024 * 1024):.2f} MB, "
+                   f"render {render_seconds:.2f}s, encode {result.encode_seconds:.2f}s")
+        self.save_status_label.configure(text=f"Saved {summary}")
+        tkinter.messagebox.showinfo("Success", f"Image saved successfully!\n{summary}")
+    
+    def _renditions_finished(self, report):
+        """Report the files written and where the time went; runs on the Tk main thread"""
+        self._end_save()
+        summary = (f"{len(report.results)} files, {report.total_bytes / (1024 * 1024):.2f} MB in {report.elapsed:.2f}s "
+                   f"(render {report.render_seconds:.2f}s, downscale {report.resize_seconds:.2f}s)")
+        if report.skipped_sizes:
+            summary += f"\nSkipped sizes larger than the image: {', '.join(map(str, report.skipped_sizes))}"
+        self.save_status_label.configure(text=f"Exported {len(report.results)} renditions")
+        tkinter.messagebox.showinfo("Export Renditions", f"Renditions exported successfully!\n{summary}")
+    
+    def _save_failed(self, error: Exception):
+        self._end_save()
+        self.save_status_label.configure(text="Save failed")
+        tkinter.messagebox.showerror("Error", f"Error saving image: {str(error)}")
+
+    def _current_recipe(self):
+        """The current edit as a recipe, or None after telling the user why it has none"""
+        contrast_value, brightness_value, blur_value = self._get_current_slider_values()
+        try:
+            return self.image_model.recipe(contrast_value, brightness_value, blur_value)
+        except ValueError as e:
+            tkinter.messagebox.showerror("Error", str(e))
+            return None
+    
+    def save_recipe(self):
+        """Save the current edit as a JSON or TOML recipe"""
+        if not self.image_model.has_enhanced_image():
+            tkinter.messagebox.showwarning("Warning", "No edit to save. Please open an image first.")
+            return
+        recipe = self._current_recipe()
+        if recipe is None:
+            return
+        file_path = self.image_processor.save_recipe_dialog()
+        if file_path:
+            self.image_processor.save_recipe(recipe, file_path)
+    
+    def batch_apply(self):
+        """Apply the current edit to a selection of files in the background"""
+        if not self.image_model.has_enhanced_image():
+            tkinter.messagebox.showwarning("Warning", "No edit to apply. Please open an image first.")
+            return
+        if self.batch_dialog.busy:
+            tkinter.messagebox.showinfo("Batch Apply", "A batch is already in progress.")
+            return
+        recipe = self._current_recipe()
+        if recipe is None:
+            return
+        
+        input_paths = self.image_processor.open_images_dialog()
+        if not input_paths:
+            return
+        output_dir = self.image_processor.open_folder_dialog("Select Output Folder")
+        if not output_dir:
+            return
+        self.batch_dialog.start(recipe, list(input_paths), output_dir, self.preset_menu.get())
 
     def resize_image(self):
         if not self.image_model.has_enhanced_image():
@@ -227,16 +536,16 @@ class ImageEditorGUI:
 
             resized_image = self.image_processor.resize_image(self.image_model.enhanced_image, new_width, new_height)
             if resized_image:
-                # Save current state to undo stack
+                # Record the operation in the undo history
                 contrast_value, brightness_value, blur_value = self._get_current_slider_values()
-                self.image_model.add_to_undo_stack(
-                    self.image_model.enhanced_image, 
-                    contrast_value, 
-                    brightness_value, 
+                self.image_model.apply_operation(
+                    'resize',
+                    {'width': new_width, 'height': new_height},
+                    resized_image,
+                    contrast_value,
+                    brightness_value,
                     blur_value
                 )
-                
-                self.image_model.set_enhanced_image(resized_image)
                 self.update_image()
 
         except ValueError:
@@ -248,16 +557,16 @@ class ImageEditorGUI:
         if self.image_model.has_enhanced_image():
             grayscale_img = self.image_processor.convert_to_grayscale(self.image_model.enhanced_image)
             if grayscale_img:
-                # Save current state to undo stack
+                # Record the operation in the undo history
                 contrast_value, brightness_value, blur_value = self._get_current_slider_values()
-                self.image_model.add_to_undo_stack(
-                    self.image_model.enhanced_image, 
-                    contrast_value, 
-                    brightness_value, 
+                self.image_model.apply_operation(
+                    'grayscale',
+                    {},
+                    grayscale_img,
+                    contrast_value,
+                    brightness_value,
                     blur_value
                 )
-                
-                self.image_model.set_enhanced_image(grayscale_img)
                 self.update_image()
         else:
             tkinter.messagebox.showwarning("Warning", "No image to convert. Please open an image first.")
@@ -1,13 +1,17 @@
 import customtkinter as ctk
-from typing import Tuple
+from typing import Optional, Tuple
+from utils.screen_utils import ScreenUtils
 import config
 
 class MainWindow:
     """Main window setup and configuration"""
     
-    def __init__(self, window_size: Tuple[str, str]):
+    def __init__(self, window_size: Optional[Tuple[str, str]] = None):
         self.root = ctk.CTk()
-        self.window_size = window_size
+        # Tk already knows the screen size; probing monitors is left to fit_to_primary_monitor
+        self.window_size = window_size or ScreenUtils.window_size_for(
+            self.root.winfo_screenwidth(), self.root.winfo_screenheight()
+        )
         self._setup_window()
         self._create_frames()
     
@@ -40,6 +44,26 @@ class MainWindow:
         )
         self.toolsframe.place(relx=0.99, rely=0.02, anchor="ne")
     
+    def show(self):
+        """Draw the window now, before the event loop starts"""
+        self.root.update()
+    
+    def fit_to_primary_monitor(self):
+        """
+        Resize the window for the primary monitor.
+        
+        Tk reports the whole virtual screen, which spans every monitor on
+        multi-monitor X11 setups, so this refines the initial size once the
+        window is up. Nothing changes when the sizes agree.
+        """
+        size = ScreenUtils.primary_monitor_size()
+        if size is None:
+            return
+        window_size = ScreenUtils.window_size_for(*size)
+        if window_size != self.window_size:
+            self.window_size = window_size
+            self.root.geometry(f"{window_size[0]}x{window_size[1]}")
+    
     def get_root(self) -> ctk.CTk:
         """Get the root window"""
         return self.root
@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+import config
+
+class RenderScheduler:
+    """
+    Renders slider previews on a worker thread without blocking Tk.
+
+    Requests are coalesced (latest wins): while a frame is rendering only the most
+    recent request is kept. Finished frames are handed back to the Tk main thread
+    by a short root.after poll, and frames older than the last one shown, or
+    submitted before a cancel(), are dropped.
+    """
+
+    def __init__(self, root, render_fn: Callable[[Any], Any], deliver_fn: Callable[[Any], None],
+                 error_fn: Optional[Callable[[Exception], None]] = None):
+        settings = config.RENDER_SETTINGS
+        self.root = root
+        self.render_fn = render_fn
+        self.deliver_fn = deliver_fn
+        self.error_fn = error_fn
+        self.poll_interval_ms = settings['poll_interval_ms']
+        self.fps_window = settings['fps_window']
+
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._cancelled_generation = 0
+        self._delivered_generation = 0
+        self._pending = None
+        self._result = None
+        self._rendering = False
+        self._polling = False
+        self._stopped = False
+        self._frame_times = deque()
+
+        self._thread = threading.Thread(target=self._worker, name="preview-render", daemon=True)
+        self._thread.start()
+
+    def submit(self, params: Any):
+        """Queue a render, replacing any request that has not started yet"""
+        with self._condition:
+            self._generation += 1
+            self._pending = (self._generation, params)
+            self._condition.notify()
+        self._ensure_polling()
+
+    def cancel(self):
+        """Drop the queued request and any frame still in flight"""
+        with self._condition:
+            self._cancelled_generation = self._generation
+            self._pending = None
+            self._result = None
+
+    def stop(self):
+        """Stop the worker thread"""
+        with self._condition:
+            self._stopped = True
+            self._pending = None
+            self._condition.notify()
+
+    @property
+    def fps(self) -> float:
+        """Frames delivered per second over the last fps_window seconds"""
+        self._trim_frame_times(time.perf_counter())
+        return len(self._frame_times) / self.fps_window
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                generation, params = self._pending
+                self._pending = None
+                self._rendering = True
+            try:
+                result = (generation, self.render_fn(params), None)
+            except Exception as e:
+                result = (generation, None, e)
+            with self._condition:
+                self._rendering = False
+                if generation > self._cancelled_generation:
+                    self._result = result
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval_ms, self._poll)
+
+    def _poll(self):
+        """Runs on the Tk main thread: deliver the newest finished frame"""
+        with self._condition:
+            result = self._result
+            self._result = None
+            busy = self._rendering or self._pending is not None
+
+        if result:
+            generation, frame, error = result
+            if generation > max(self._delivered_generation, self._cancelled_generation):
+                self._delivered_generation = generation
+                if error is not None:
+                    if self.error_fn:
+                        self.error_fn(error)
+                else:
+                    self.deliver_fn(frame)
+                    now = time.perf_counter()
+                    self._frame_times.append(now)
+                    self._trim_frame_times(now)
+
+        if busy and not self._stopped:
+            self.root.after(self.poll_interval_ms, self._poll)
+        else:
+            self._polling = False
+
+    def _trim_frame_times(self, now: float):
+        while self._frame_times and now - self._frame_times[0] > self.fps_window:
+            self._frame_times.popleft()
@@ -5,27 +5,45 @@ Image Editor Application
 A modern image editing application built with CustomTkinter and PIL.
 Provides basic image editing features including contrast, brightness, blur adjustments,
 grayscale conversion, resizing, and undo/redo functionality.
+
+The window is drawn before the editor and PIL are imported, and the monitor
+probe runs once the event loop is up, so the first frame appears as early as
+possible. Set PARAMETRIA_STARTUP_REPORT=1 to print startup milestones and exit
+(used by benchmarks/bench_startup.py).
 """
 
-from utils.screen_utils import ScreenUtils
+import os
 from gui.main_window import MainWindow
-from gui.image_editor_gui import ImageEditorGUI
+
+def _report(milestone: str):
+    """Print a startup milestone for benchmarks/bench_startup.py"""
+    print(f"startup {milestone}", flush=True)
 
 def main():
     """Main entry point for the image editor application"""
-    # Get optimal window size
-    window_size = ScreenUtils.get_optimal_window_size()
+    report = bool(os.environ.get('PARAMETRIA_STARTUP_REPORT'))
     
-    # Create main window
-    main_window = MainWindow(window_size)
+    # Create and draw the main window; its size comes from Tk for now
+    main_window = MainWindow()
+    main_window.show()
+    if report:
+        _report("first_frame")
     
     # Create image editor GUI
+    from gui.image_editor_gui import ImageEditorGUI
     image_editor = ImageEditorGUI(
         main_window.get_root(),
         main_window.get_picframe(),
         main_window.get_toolsframe()
     )
     
+    root = main_window.get_root()
+    root.after_idle(main_window.fit_to_primary_monitor)
+    if report:
+        main_window.show()
+        _report("ready")
+        root.after_idle(root.destroy)
+    
     # Start the application
     main_window.run()
 
@@ -0,0 +1,159 @@
+import zlib
+from collections import OrderedDict
+from PIL import Image
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from services.image_operations import ImageOperations
+import config
+
+# Destructive operations that can be replayed to rebuild an earlier image
+OPERATIONS: Dict[str, Callable[..., Image.Image]] = {
+    'grayscale': ImageOperations.convert_to_grayscale,
+    'resize': ImageOperations.resize_image
+}
+
+class HistoryEntry(NamedTuple):
+    """One undo step: which base image it uses plus the slider values"""
+    base_id: int
+    contrast: float
+    brightness: float
+    blur: float
+
+class Keyframe(NamedTuple):
+    """A compressed snapshot of a base image"""
+    mode: str
+    size: Tuple[int, int]
+    data: bytes
+    palette: Optional[List[int]]
+
+    @classmethod
+    def from_image(cls, image: Image.Image, level: int) -> 'Keyframe':
+        palette = image.getpalette() if image.mode == 'P' else None
+        return cls(image.mode, image.size, zlib.compress(image.tobytes(), level), palette)
+
+    def to_image(self) -> Image.Image:
+        image = Image.frombytes(self.mode, self.size, zlib.decompress(self.data))
+        if self.palette:
+            image.putpalette(self.palette)
+        return image
+
+class EditHistory:
+    """
+    Undo/redo history that stores slider values and operation records instead of
+    full image copies.
+
+    Slider changes only record parameters. Destructive operations (grayscale,
+    resize) create a new numbered base image; every keyframe_interval-th base is
+    kept as a zlib-compressed keyframe and earlier bases are rebuilt by replaying
+    operations from the nearest keyframe (or the original image). Keyframes are
+    evicted least-recently-used first once they exceed budget_bytes.
+    """
+
+    def __init__(self, original_image: Image.Image, budget_bytes: Optional[int] = None,
+                 keyframe_interval: Optional[int] = None):
+        settings = config.HISTORY_SETTINGS
+        defaults = config.DEFAULT_SLIDER_VALUES
+        self.budget_bytes = settings['budget_bytes'] if budget_bytes is None else budget_bytes
+        self.keyframe_interval = keyframe_interval or settings['keyframe_interval']
+        self.compression_level = settings['compression_level']
+
+        self._original = original_image
+        self._operations: List[Tuple[str, Dict]] = []  # _operations[k - 1] produced base k
+        self._keyframes: 'OrderedDict[int, Keyframe]' = OrderedDict()
+        self._keyframe_bytes = 0
+        self._current_base: Tuple[int, Image.Image] = (0, original_image)
+
+        self.undo_stack: List[HistoryEntry] = [
+            HistoryEntry(0, defaults['contrast'], defaults['brightness'], defaults['blur'])
+        ]
+        self.redo_stack: List[HistoryEntry] = []
+
+    @property
+    def keyframe_bytes(self) -> int:
+        """Compressed bytes currently held by keyframes"""
+        return self._keyframe_bytes
+
+    def can_undo(self) -> bool:
+        return len(self.undo_stack) > 1
+
+    def can_redo(self) -> bool:
+        return bool(self.redo_stack)
+
+    def current_operations(self) -> List[Tuple[str, Dict]]:
+        """Operations that produced the current base image, oldest first"""
+        return list(self._operations[:self.undo_stack[-1].base_id])
+
+    def record_adjustment(self, contrast: float, brightness: float, blur: float):
+        """Record new slider values on top of the current base image"""
+        base_id = self.undo_stack[-1].base_id
+        self.undo_stack.append(HistoryEntry(base_id, contrast, brightness, blur))
+        self.redo_stack.clear()
+
+    def record_operation(self, name: str, params: Dict, image: Image.Image,
+                         contrast: float, brightness: float, blur: float):
+        """Record a destructive operation and the image it produced"""
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {name}")
+        base_id = self.undo_stack[-1].base_id + 1
+
+        # Anything past the current base belonged to the discarded redo branch
+        del self._operations[base_id - 1:]
+        for stale_id in [key for key in self._keyframes if key >= base_id]:
+            self._drop_keyframe(stale_id)
+
+        self._operations.append((name, dict(params)))
+        self._current_base = (base_id, image)
+        if base_id % self.keyframe_interval == 0:
+            self._store_keyframe(base_id, image)
+
+        self.undo_stack.append(HistoryEntry(base_id, contrast, brightness, blur))
+        self.redo_stack.clear()
+
+    def undo(self) -> Optional[Tuple[Image.Image, float, float, float]]:
+        """Step back and return the previous (image, contrast, brightness, blur)"""
+        if not self.can_undo():
+            return None
+        self.redo_stack.append(self.undo_stack.pop())
+        return self._state(self.undo_stack[-1])
+
+    def redo(self) -> Optional[Tuple[Image.Image, float, float, float]]:
+        """Step forward and return the restored (image, contrast, brightness, blur)"""
+        if not self.can_redo():
+            return None
+        entry = self.redo_stack.pop()
+        self.undo_stack.append(entry)
+        return self._state(entry)
+
+    def _state(self, entry: HistoryEntry) -> Tuple[Image.Image, float, float, float]:
+        return self._base_image(entry.base_id), entry.contrast, entry.brightness, entry.blur
+
+    def _base_image(self, base_id: int) -> Image.Image:
+        """Rebuild a base image from the nearest earlier snapshot"""
+        current_id, current_image = self._current_base
+        if current_id == base_id:
+            return current_image
+
+        start_id, image = 0, self._original
+        if start_id < current_id <= base_id:
+            start_id, image = current_id, current_image
+        keyframe_ids = [key for key in self._keyframes if start_id < key <= base_id]
+        if keyframe_ids:
+            start_id = max(keyframe_ids)
+            self._keyframes.move_to_end(start_id)
+            image = self._keyframes[start_id].to_image()
+
+        for name, params in self._operations[start_id:base_id]:
+            image = OPERATIONS[name](image, **params)
+
+        self._current_base = (base_id, image)
+        return image
+
+    def _store_keyframe(self, base_id: int, image: Image.Image):
+        keyframe = Keyframe.from_image(image, self.compression_level)
+        self._keyframes[base_id] = keyframe
+        self._keyframe_bytes += len(keyframe.data)
+        while self._keyframe_bytes > self.budget_bytes and self._keyframes:
+            self._drop_keyframe(next(iter(self._keyframes)))
+
+    def _drop_keyframe(self, base_id: int):
+        keyframe = self._keyframes.pop(base_id)
+        self._keyframe_bytes -= len(keyframe.data)
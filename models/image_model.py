@@ -1,5 +1,14 @@
+import os
+import threading
 from PIL import Image, ImageTk
-from typing import List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
+from models.edit_history import EditHistory, OPERATIONS
+from models.edit_pipeline import EditPipeline
+from models.recipe import Recipe
+from services.enhancement_kernel import EnhancementKernel
+from services.image_operations import ImageOperations
+from services.resize_engine import ResizeEngine
+import config
 
 class ImageModel:
     """Model class to manage image state and data"""
@@ -8,38 +17,159 @@ class ImageModel:
         self.original_image: Optional[Image.Image] = None
         self.display_image: Optional[ImageTk.PhotoImage] = None
         self.enhanced_image: Optional[Image.Image] = None
-        self.undo_stack: List[Tuple[Image.Image, float, float, float]] = []
+        self.proxy_image: Optional[Image.Image] = None
+        self.proxy_scale: float = 1.0
+        self.source_path: Optional[str] = None
+        self.source_size: Optional[Tuple[int, int]] = None
+        self.history: Optional[EditHistory] = None
+        self.preview_pipeline = EditPipeline()
+        self.export_pipeline = EditPipeline(
+            cache_bytes=config.PIPELINE_SETTINGS['export_cache_bytes']
+        )
+        self._export_lock = threading.Lock()
     
-    def set_original_image(self, image: Image.Image):
-        """Set the original image and initialize state"""
+    def set_original_image(self, image: Image.Image, source_path: Optional[str] = None):
+        """
+        Set the original image and initialize state.
+        
+        When source_path is given, image is a reduced-size working copy of that file
+        and render_full re-decodes the file at full resolution for export.
+        """
         self.original_image = image
         self.enhanced_image = image.copy()
-        self.undo_stack = [(image.copy(), 1.0, 1.0, 0.0)]
+        self.source_path = source_path
+        self.source_size = ImageOperations.read_size(source_path) if source_path else None
+        self.history = EditHistory(image)
+        self._update_proxy()
     
     def set_enhanced_image(self, image: Image.Image):
         """Set the enhanced image"""
-        self.enhanced_image = image
+        if image is not self.enhanced_image:
+            self.enhanced_image = image
+            self._update_proxy()
+    
+    def _update_proxy(self):
+        """Rebuild the display-sized proxy used for slider previews"""
+        # Expand palette images once here rather than on every preview render
+        proxy = ImageOperations.editable(ImageOperations.fit_within(self.enhanced_image, config.MAX_IMAGE_SIZE))
+        self.proxy_image = proxy
+        if config.TONE_LUT_SETTINGS['precompute'] and EnhancementKernel.supports(proxy):
+            EnhancementKernel.precompute_async(proxy)
+        self.proxy_scale = proxy.width / self.full_resolution_size()[0]
+        self.preview_pipeline.set_source(proxy)
+    
+    def full_resolution_size(self) -> Tuple[int, int]:
+        """Size of the current enhanced image once rendered at full resolution"""
+        if not self.source_path:
+            return self.enhanced_image.size
+        size = self.source_size
+        for name, params in self.history.current_operations():
+            if name == 'resize':
+                size = ResizeEngine.target(size, (params['width'], params['height']), params.get('mode', 'exact'))[0]
+        return size
+    
+    def preview_blur(self, blur: float) -> float:
+        """Scale a full-resolution blur radius to the proxy resolution"""
+        return blur * self.proxy_scale
+    
+    def render_preview(self, contrast: float, brightness: float, blur: float) -> Image.Image:
+        """Render slider values on the display-sized proxy"""
+        return self.preview_pipeline.render({
+            'contrast': contrast,
+            'brightness': brightness,
+            'blur': self.preview_blur(blur),
+            'blur_method': config.BLUR_SETTINGS['preview_method']
+        })
+    
+    def render_full(self, contrast: float, brightness: float, blur: float) -> Image.Image:
+        """Render slider values on the full-resolution enhanced image"""
+        return self.export_renderer(contrast, brightness, blur)()
+    
+    def export_renderer(self, contrast: float, brightness: float, blur: float) -> Callable[[], Image.Image]:
+        """
+        Capture the current edit state and return a function that renders it at full resolution.
+
+        The returned function may run on a worker thread while editing continues;
+        later edits do not affect it.
+        """
+        params = {'contrast': contrast, 'brightness': brightness, 'blur': blur}
+        if self.source_path:
+            # The file is only re-decoded when the result is not cached; the key
+            # identifies the file version and the operations replayed on it
+            source_path = self.source_path
+            operations = self.history.current_operations()
+            stat = os.stat(source_path)
+            source_key = repr((source_path, stat.st_mtime_ns, stat.st_size, operations))
+            
+            def set_source():
+                self.export_pipeline.set_source_loader(
+                    lambda: self._decode_full_resolution(source_path, operations), source_key
+                )
+        else:
+            image = self.enhanced_image
+            
+            def set_source():
+                self.export_pipeline.set_source(image)
+        
+        def render() -> Image.Image:
+            with self._export_lock:
+                set_source()
+                return self.export_pipeline.render(params)
+        return render
+    
+    @staticmethod
+    def _decode_full_resolution(source_path: str, operations: List[Tuple[str, Dict]]) -> Image.Image:
+        """Decode the source at full size and replay the recorded operations on it"""
+        image = ImageOperations.load_image(source_path)
+        for name, params in operations:
+            image = OPERATIONS[name](image, **params)
+        return image
+    
+    def recipe(self, contrast: float, brightness: float, blur: float) -> Dict:
+        """The current edit as recipe parameters for saving or batch application"""
+        return Recipe.from_edit(self.history.current_operations(), contrast, brightness, blur)
+    
+    def cache_stats(self) -> Dict[str, Dict[str, float]]:
+        """Hit/miss/eviction counters of the preview and export render caches"""
+        return {
+            'preview': self.preview_pipeline.cache.stats(),
+            'export': self.export_pipeline.cache.stats()
+        }
     
     def set_display_image(self, image: ImageTk.PhotoImage):
         """Set the display image"""
         self.display_image = image
     
-    def add_to_undo_stack(self, image: Image.Image, contrast: float, brightness: float, blur: float):
-        """Add state to undo stack"""
-        self.undo_stack.append((image.copy(), contrast, brightness, blur))
+    def record_adjustment(self, contrast: float, brightness: float, blur: float):
+        """Record new slider values in the undo history"""
+        self.history.record_adjustment(contrast, brightness, blur)
+    
+    def apply_operation(self, name: str, params: Dict, image: Image.Image,
+                        contrast: float, brightness: float, blur: float):
+        """Make the result of a destructive operation current and record it"""
+        self.history.record_operation(name, params, image, contrast, brightness, blur)
+        self.set_enhanced_image(image)
     
     def undo_last_change(self) -> Optional[Tuple[Image.Image, float, float, float]]:
         """Undo last change and return previous state"""
-        if len(self.undo_stack) > 1:
-            self.undo_stack.pop()
-            return self.undo_stack[-1]
-        return None
+        state = self.history.undo() if self.history else None
+        if state:
+            self.set_enhanced_image(state[0])
+        return state
+    
+    def redo_last_change(self) -> Optional[Tuple[Image.Image, float, float, float]]:
+        """Redo the last undone change and return the restored state"""
+        state = self.history.redo() if self.history else None
+        if state:
+            self.set_enhanced_image(state[0])
+        return state
     
     def reset_to_original(self):
         """Reset to original state"""
         if self.original_image:
             self.enhanced_image = self.original_image.copy()
-            self.undo_stack = [(self.enhanced_image.copy(), 1.0, 1.0, 0.0)]
+            self.history = EditHistory(self.original_image)
+            self._update_proxy()
     
     def has_image(self) -> bool:
         """Check if there's an image loaded"""
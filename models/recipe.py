@@ -0,0 +1,135 @@
+import json
+import os
+from typing import Any, Dict, List, Tuple
+from models.edit_pipeline import DEFAULT_PARAMS
+from services.blur_engine import BLUR_METHODS
+from services.resize_engine import RESAMPLE_FILTERS, RESIZE_MODES
+
+RECIPE_VERSION = 1
+
+class Recipe:
+    """
+    Reads, writes and validates edit recipes.
+
+    A recipe is the pipeline parameter dict used by EditPipeline and batch
+    processing (resize, resize_mode, resize_filter, grayscale, contrast,
+    brightness, blur, blur_method), stored as JSON or TOML with a version
+    number, e.g.
+
+        version = 1
+        contrast = 1.2
+        brightness = 1.0
+        blur = 0.5
+        grayscale = true
+        resize = [1024, 768]
+        resize_mode = "fit"
+
+    Keys that are left out keep their neutral defaults.
+    """
+
+    @staticmethod
+    def validate(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Check a loaded recipe and return a complete parameter dict; raises ValueError"""
+        data = dict(data)
+        version = data.pop('version', RECIPE_VERSION)
+        if version != RECIPE_VERSION:
+            raise ValueError(f"Unsupported recipe version {version}")
+        unknown = set(data) - set(DEFAULT_PARAMS)
+        if unknown:
+            raise ValueError(f"Unknown recipe keys: {', '.join(sorted(unknown))}")
+
+        params = {**DEFAULT_PARAMS, **data}
+        for name in ('contrast', 'brightness', 'blur'):
+            if isinstance(params[name], bool) or not isinstance(params[name], (int, float)):
+                raise ValueError(f"Recipe '{name}' must be a number")
+            params[name] = float(params[name])
+        if params['contrast'] < 0 or params['brightness'] < 0 or params['blur'] < 0:
+            raise ValueError("Recipe contrast, brightness and blur must not be negative")
+        if not isinstance(params['grayscale'], bool):
+            raise ValueError("Recipe 'grayscale' must be true or false")
+        if params['resize'] is not None:
+            resize = params['resize']
+            if (not isinstance(resize, (list, tuple)) or len(resize) != 2
+                    or not all(isinstance(value, int) and value > 0 for value in resize)):
+                raise ValueError("Recipe 'resize' must be [width, height] in positive pixels")
+            params['resize'] = tuple(resize)
+        if params['resize_mode'] not in RESIZE_MODES:
+            raise ValueError(f"Recipe 'resize_mode' must be one of {', '.join(RESIZE_MODES)}")
+        if params['resize_filter'] is not None and params['resize_filter'] not in RESAMPLE_FILTERS:
+            raise ValueError(f"Recipe 'resize_filter' must be one of {', '.join(RESAMPLE_FILTERS)}")
+        if params['blur_method'] is not None and params['blur_method'] not in BLUR_METHODS:
+            raise ValueError(f"Recipe 'blur_method' must be one of {', '.join(BLUR_METHODS)}")
+        return params
+
+    @staticmethod
+    def from_edit(operations: List[Tuple[str, Dict]], contrast: float, brightness: float,
+                  blur: float) -> Dict[str, Any]:
+        """
+        Capture an editor state: its grayscale/resize history plus slider values.
+
+        The pipeline resizes before converting to grayscale, and a recipe holds a
+        single resize, so repeated resizes collapse into the last one. That keeps
+        the output size and framing only when no earlier resize crops (fill) and,
+        unless the last resize is exact, none changes the aspect ratio (exact);
+        other chains raise ValueError. The result can still differ from the
+        editor's own chain in resampling detail.
+        """
+        params = {**DEFAULT_PARAMS, 'contrast': contrast, 'brightness': brightness, 'blur': blur}
+        resize_modes = []
+        for name, operation_params in operations:
+            if name == 'grayscale':
+                params['grayscale'] = True
+            elif name == 'resize':
+                params['resize'] = (operation_params['width'], operation_params['height'])
+                params['resize_mode'] = operation_params.get('mode', 'exact')
+                params['resize_filter'] = operation_params.get('filter_name')
+                resize_modes.append(params['resize_mode'])
+        earlier = resize_modes[:-1]
+        if 'fill' in earlier or ('exact' in earlier and params['resize_mode'] != 'exact'):
+            raise ValueError("A recipe holds one resize, and this edit's resizes "
+                             f"({' then '.join(resize_modes)}) cannot be combined into one")
+        return params
+
+    @staticmethod
+    def load(file_path: str) -> Dict[str, Any]:
+        """Load a .json or .toml recipe"""
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension == '.json':
+            with open(file_path) as f:
+                data = json.load(f)
+        elif extension == '.toml':
+            try:
+                import tomllib
+            except ImportError:
+                raise ValueError("TOML recipes need Python 3.11 or newer; use JSON instead")
+            with open(file_path, 'rb') as f:
+                data = tomllib.load(f)
+        else:
+            raise ValueError(f"Recipe files must be .json or .toml, not '{extension}'")
+        if not isinstance(data, dict):
+            raise ValueError("A recipe must be a table of settings")
+        return Recipe.validate(data)
+
+    @staticmethod
+    def save(params: Dict[str, Any], file_path: str):
+        """Write params as a .json or .toml recipe"""
+        params = Recipe.validate(params)
+        document = {'version': RECIPE_VERSION}
+        for name, value in params.items():
+            if value != DEFAULT_PARAMS[name]:
+                document[name] = list(value) if isinstance(value, tuple) else value
+
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension == '.json':
+            text = json.dumps(document, indent=2) + "\n"
+        elif extension == '.toml':
+            text = "".join(f"{name} = {Recipe._toml_value(value)}\n" for name, value in document.items())
+        else:
+            raise ValueError(f"Recipe files must be .json or .toml, not '{extension}'")
+        with open(file_path, 'w') as f:
+            f.write(text)
+
+    @staticmethod
+    def _toml_value(value: Any) -> str:
+        # json.dumps spells strings, numbers and arrays of numbers as TOML does
+        return ('true' if value else 'false') if isinstance(value, bool) else json.dumps(value)
@@ -0,0 +1,96 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from PIL import Image
+from typing import Dict, Optional
+
+def image_bytes(image: Image.Image) -> int:
+    """Approximate decoded size of image in bytes"""
+    sample_bytes = 4 if image.mode in ('I', 'F') else 1
+    return image.width * image.height * len(image.getbands()) * sample_bytes
+
+def content_key(image: Image.Image) -> str:
+    """Hash of an image's mode, size and pixels, identifying it across copies"""
+    digest = hashlib.blake2b(repr((image.mode, image.size)).encode(), digest_size=16)
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+class RenderCache:
+    """
+    Least-recently-used cache of rendered images bounded by total pixel bytes.
+
+    Keys are strings built by the caller (EditPipeline chains a source content
+    hash with the rounded stage parameters). hits, misses and evictions count
+    lookups since creation or the last reset_stats().
+    """
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self._entries: 'OrderedDict[str, Image.Image]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget_bytes > 0
+
+    @property
+    def bytes_used(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Image.Image]:
+        """Return the cached image for key, counting a hit or a miss"""
+        with self._lock:
+            image = self._entries.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def contains(self, key: str) -> bool:
+        """Check for key without touching the counters or the LRU order"""
+        return key in self._entries
+
+    def put(self, key: str, image: Image.Image):
+        """Store image, evicting least-recently-used entries beyond the budget"""
+        size = image_bytes(image)
+        if size > self.budget_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= image_bytes(self._entries.pop(key))
+            self._entries[key] = image
+            self._bytes += size
+            while self._bytes > self.budget_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= image_bytes(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Counters plus current occupancy and hit rate"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'budget_bytes': self.budget_bytes
+        }
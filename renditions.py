@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Parametria Rendition Export
+
+Headless entry point (parametria-renditions) that renders an edit recipe
+once per image and writes it at several sizes and formats, e.g. for a
+responsive web page's srcset.
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+from models.recipe import Recipe
+from services.batch_processor import BatchProcessor
+from services.rendition_export import RenditionExporter, RenditionResult
+from services.resize_engine import RESAMPLE_FILTERS
+import config
+
+def parse_sizes(value: str) -> List[int]:
+    """Parse a comma-separated list of longest sides, e.g. 2048,1024,512"""
+    try:
+        sizes = [int(part) for part in value.split(',') if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError("sizes must look like 2048,1024,512")
+    if not sizes or min(sizes) <= 0:
+        raise argparse.ArgumentTypeError("sizes must be positive numbers")
+    return sizes
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser"""
+    settings = config.RENDITION_SETTINGS
+    parser = argparse.ArgumentParser(
+        prog="parametria-renditions",
+        description="Write each edited image at several sizes and formats from one render."
+    )
+    parser.add_argument("inputs", nargs="+", help="input directories, files or glob patterns")
+    parser.add_argument("-o", "--output-dir", required=True, help="directory for the renditions")
+    parser.add_argument("--recipe", metavar="FILE", help="JSON or TOML recipe saved from the editor")
+    parser.add_argument("--sizes", type=parse_sizes,
+                        help=f"longest sides in pixels (default: {','.join(map(str, settings['sizes']))})")
+    parser.add_argument("--formats", type=lambda value: [part for part in value.split(',') if part.strip()],
+                        help=f"output extensions (default: {','.join(settings['formats'])})")
+    parser.add_argument("--filter", dest="filter_name", choices=list(RESAMPLE_FILTERS),
+                        help="downscaling filter (default: RESIZE_SETTINGS['filter'])")
+    parser.add_argument("--preset", choices=list(config.ENCODER_PRESETS),
+                        help="encoder preset (default: SAVE_SETTINGS['preset'])")
+    parser.add_argument("-j", "--workers", type=int, help="encoder threads (default: CPU count)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print the summary")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Export renditions and return the process exit code"""
+    args = build_parser().parse_args(argv)
+    try:
+        recipe = Recipe.load(args.recipe) if args.recipe else {}
+        exporter = RenditionExporter(args.sizes, args.formats, args.preset, args.workers, args.filter_name)
+    except (OSError, ValueError) as e:
+        print(f"Cannot export renditions: {e}", file=sys.stderr)
+        return 2
+
+    input_paths = BatchProcessor.collect_inputs(args.inputs)
+    if not input_paths:
+        print("No images found.", file=sys.stderr)
+        return 1
+
+    def report_progress(result: RenditionResult):
+        if not args.quiet:
+            width, height = result.image_size
+            print(f"✓ {result.file_path} ({width}x{height}, {result.file_size / 1024:.0f} KB, "
+                  f"{result.encode_seconds:.2f}s)")
+
+    failed = 0
+    written = 0
+    for input_path in input_paths:
+        try:
+            report = exporter.export_file(input_path, recipe, args.output_dir, report_progress)
+        except Exception as e:
+            failed += 1
+            print(f"✗ {input_path}: {e}", file=sys.stderr)
+            continue
+        written += len(report.results)
+        if not args.quiet:
+            skipped = f", skipped sizes larger than the image: {report.skipped_sizes}" if report.skipped_sizes else ""
+            print(f"{input_path}: {len(report.results)} files in {report.elapsed:.2f}s "
+                  f"(render {report.render_seconds:.2f}s, downscale {report.resize_seconds:.2f}s{skipped})")
+
+    print(f"\nWrote {written} renditions of {len(input_paths) - failed}/{len(input_paths)} images")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
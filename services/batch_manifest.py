@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+import config
+
+# Bump when processing code changes so earlier outputs are no longer considered
+# current; configuration changes are covered by BatchProcessor.output_settings
+MANIFEST_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inputs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS outputs (
+    output_path TEXT PRIMARY KEY,
+    input_hash TEXT NOT NULL,
+    recipe_hash TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outputs_by_job ON outputs (input_hash, recipe_hash);
+"""
+
+class BatchManifest:
+    """
+    SQLite record of which batch outputs were produced from which inputs.
+
+    Each output is stored with the content hash of its input and the hash of
+    the recipe and encoder settings that made it, plus the output's mtime and
+    size. An output is up to date while all four still match, so reruns only
+    process new or changed files and changed recipes. Input hashes are cached by
+    path, mtime and size, so unchanged inputs are not read again.
+
+    The database uses WAL journaling and a busy timeout, so several batch runs
+    (or editor instances) can share one manifest; every write is a short
+    transaction.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._connection = sqlite3.connect(db_path, timeout=config.BATCH_SETTINGS['manifest_timeout'])
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    @staticmethod
+    def recipe_hash(recipe: Dict[str, Any], **settings) -> str:
+        """Hash of the resolved recipe plus any other settings that change the output bytes"""
+        document = {'version': MANIFEST_VERSION, 'recipe': recipe, 'settings': settings}
+        encoded = json.dumps(document, sort_keys=True, default=list).encode()
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+    @staticmethod
+    def file_hash(file_path: str) -> str:
+        """Content hash of a file, read in chunks"""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def input_hashes(self, input_paths: Iterable[str], workers: int = 1) -> Dict[str, str]:
+        """Content hashes of input_paths, hashing only files not seen at their current mtime and size"""
+        stats = {os.path.abspath(path): os.stat(path) for path in input_paths}
+        hashes = {}
+        for path, stat in stats.items():
+            row = self._connection.execute(
+                "SELECT content_hash FROM inputs WHERE path = ? AND mtime_ns = ? AND size = ?",
+                (path, stat.st_mtime_ns, stat.st_size)
+            ).fetchone()
+            if row:
+                hashes[path] = row[0]
+
+        missing = [path for path in stats if path not in hashes]
+        # hashlib releases the GIL on large buffers, so threads hash files concurrently
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for path, content_hash in zip(missing, executor.map(self.file_hash, missing)):
+                hashes[path] = content_hash
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO inputs VALUES (?, ?, ?, ?)",
+                [(path, stats[path].st_mtime_ns, stats[path].st_size, hashes[path]) for path in missing]
+            )
+        return hashes
+
+    @staticmethod
+    def _matches(row, file_path: str) -> bool:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        return (stat.st_mtime_ns, stat.st_size) == (row[0], row[1])
+
+    def is_current(self, input_hash: str, recipe_hash: str, output_path: str) -> bool:
+        """True if output_path was made from this input and recipe and has not changed since"""
+        row = self._connection.execute(
+            "SELECT mtime_ns, size FROM outputs WHERE output_path = ? AND input_hash = ? AND recipe_hash = ?",
+            (os.path.abspath(output_path), input_hash, recipe_hash)
+        ).fetchone()
+        return row is not None and self._matches(row, output_path)
+
+    def find_output(self, input_hash: str, recipe_hash: str, extension: str) -> Optional[str]:
+        """An existing, unchanged output of the same input and recipe with the given extension"""
+        rows = self._connection.execute(
+            "SELECT mtime_ns, size, output_path FROM outputs WHERE input_hash = ? AND recipe_hash = ?",
+            (input_hash, recipe_hash)
+        ).fetchall()
+        for row in rows:
+            if os.path.splitext(row[2])[1].lower() == extension.lower() and self._matches(row, row[2]):
+                return row[2]
+        return None
+
+    def record(self, input_hash: str, recipe_hash: str, output_path: str):
+        """Remember that output_path, as it is now on disk, came from this input and recipe"""
+        stat = os.stat(output_path)
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO outputs VALUES (?, ?, ?, ?, ?, ?)",
+                (os.path.abspath(output_path), input_hash, recipe_hash, stat.st_mtime_ns, stat.st_size, time.time())
+            )
+
+    def outputs(self) -> List[str]:
+        return [row[0] for row in self._connection.execute("SELECT output_path FROM outputs ORDER BY output_path")]
+
+    def close(self):
+        self._connection.close()
@@ -0,0 +1,356 @@
+import glob
+import os
+import shutil
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from services.image_operations import ImageOperations
+from services.parallel_renderer import ParallelRenderer
+from services.tiled_processor import TiledProcessor
+from models.edit_pipeline import DEFAULT_PARAMS, EditPipeline
+import config
+
+if TYPE_CHECKING:
+    from services.batch_manifest import BatchManifest
+
+DEFAULT_RECIPE = DEFAULT_PARAMS
+
+class BatchItemResult(NamedTuple):
+    """Outcome of processing a single file"""
+    input_path: str
+    output_path: Optional[str]
+    error: Optional[str]
+    seconds: float
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+class BatchReport:
+    """Collected per-file results and throughput of a batch run"""
+
+    def __init__(self, results: List[BatchItemResult], elapsed: float, cancelled: bool = False):
+        self.results = results
+        self.elapsed = elapsed
+        self.cancelled = cancelled
+
+    @property
+    def succeeded(self) -> List[BatchItemResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def skipped(self) -> List[BatchItemResult]:
+        """Files whose output was already up to date or copied from an identical input"""
+        return [result for result in self.results if result.skipped]
+
+    @property
+    def failed(self) -> List[BatchItemResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def images_per_second(self) -> float:
+        """Throughput over successfully processed images, skipped ones excluded"""
+        if self.elapsed <= 0:
+            return 0.0
+        return (len(self.succeeded) - len(self.skipped)) / self.elapsed
+
+def apply_recipe(image, recipe: Dict):
+    """Apply a recipe to an image in editor order: resize, grayscale, then sliders"""
+    return EditPipeline(image, cache_bytes=0).render(recipe)
+
+def _process_file(input_path: str, output_path: str, recipe: Dict, tiled: bool = False,
+                  encoder_preset: Optional[str] = None) -> BatchItemResult:
+    """Process one file; runs inside a worker process so must stay module-level"""
+    start = time.perf_counter()
+    try:
+        if tiled:
+            TiledProcessor(recipe).process(input_path, output_path)
+        else:
+            image = ImageOperations.load_image(input_path)
+            image = apply_recipe(image, recipe)
+            ImageOperations.save_image(
+                image, output_path, **ImageOperations.encoder_options(output_path, encoder_preset)
+            )
+        return BatchItemResult(input_path, output_path, None, time.perf_counter() - start)
+    except Exception as e:
+        return BatchItemResult(input_path, None, str(e), time.perf_counter() - start)
+
+class BatchProcessor:
+    """Headless engine that applies an edit recipe to many files in parallel"""
+
+    def __init__(self, recipe: Dict, output_dir: str, workers: Optional[int] = None,
+                 output_format: Optional[str] = None, output_suffix: Optional[str] = None,
+                 tiled: bool = False, encoder_preset: Optional[str] = None,
+                 manifest: Optional[bool] = None, start_method: Optional[str] = None):
+        settings = config.BATCH_SETTINGS
+        self.recipe = {**DEFAULT_RECIPE, **recipe}
+        self.output_dir = output_dir
+        self.workers = workers or settings['workers'] or os.cpu_count() or 1
+        self.output_format = output_format or settings['output_format']
+        self.tiled = tiled
+        self.encoder_preset = encoder_preset
+        if tiled and not self.output_format:
+            # Tiled output is streamed, which only the TIFF and PNG writers support
+            self.output_format = 'tif'
+        self.output_suffix = settings['output_suffix'] if output_suffix is None else output_suffix
+        self.use_manifest = settings['manifest'] if manifest is None else manifest
+        self.start_method = start_method or settings['start_method']
+
+    @staticmethod
+    def supported_extensions() -> List[str]:
+        """Image extensions accepted by the open dialog"""
+        patterns = config.IMAGE_FILE_TYPES[0][1].split()
+        return [pattern.lstrip('*').lower() for pattern in patterns]
+
+    @staticmethod
+    def collect_inputs(sources: Iterable[str]) -> List[str]:
+        """Expand directories and glob patterns into a sorted list of image files"""
+        extensions = BatchProcessor.supported_extensions()
+        paths = set()
+        for source in sources:
+            if os.path.isdir(source):
+                candidates = [os.path.join(source, name) for name in os.listdir(source)]
+            else:
+                candidates = glob.glob(source)
+            for candidate in candidates:
+                if os.path.isfile(candidate) and os.path.splitext(candidate)[1].lower() in extensions:
+                    paths.add(candidate)
+        return sorted(paths)
+
+    def batch_inputs(self, sources: Iterable[str]) -> List[str]:
+        """
+        collect_inputs without this batch's own outputs, so an output folder that is
+        also the input folder is not processed again on the next run.
+
+        Outputs are files in the output directory whose name ends with the output
+        suffix, plus every output recorded in the manifest.
+        """
+        produced = set()
+        if self.use_manifest and os.path.exists(self.manifest_path()):
+            from services.batch_manifest import BatchManifest
+            manifest = BatchManifest(self.manifest_path())
+            try:
+                produced.update(manifest.outputs())
+            finally:
+                manifest.close()
+        output_dir = os.path.abspath(self.output_dir)
+
+        def is_output(path: str) -> bool:
+            path = os.path.abspath(path)
+            if path in produced:
+                return True
+            stem = os.path.splitext(os.path.basename(path))[0]
+            return bool(self.output_suffix) and os.path.dirname(path) == output_dir and stem.endswith(self.output_suffix)
+
+        return [path for path in self.collect_inputs(sources) if not is_output(path)]
+
+    def output_path_for(self, input_path: str) -> str:
+        """Build the output file path for an input file"""
+        stem, extension = os.path.splitext(os.path.basename(input_path))
+        if self.output_format:
+            extension = '.' + self.output_format.lower().lstrip('.')
+        return os.path.join(self.output_dir, f"{stem}{self.output_suffix}{extension}")
+
+    def manifest_path(self) -> str:
+        return os.path.join(self.output_dir, config.BATCH_SETTINGS['manifest_name'])
+
+    def run(self, input_paths: List[str],
+            progress_callback: Optional[Callable[[BatchItemResult], None]] = None,
+            cancel_event: Optional[threading.Event] = None, force: bool = False) -> BatchReport:
+        """
+        Process all files and return per-file results; errors never abort the batch.
+
+        With the manifest enabled, files whose output is still up to date are
+        skipped and inputs identical to an already processed file get a copy of
+        its output; force=True reprocesses everything and refreshes the manifest.
+        Setting cancel_event stops the run after the files already in progress;
+        files that were never started are left out of the report. Inputs whose
+        output file another input already claimed fail without being processed.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        results = []
+        start = time.perf_counter()
+
+        def report(result: BatchItemResult):
+            # Every result, processed, skipped or copied, reaches the callback once
+            results.append(result)
+            if progress_callback:
+                progress_callback(result)
+
+        input_paths, conflicts = self._claim_outputs(input_paths)
+        for result in conflicts:
+            report(result)
+
+        manifest = None
+        if self.use_manifest:
+            # sqlite3 is only loaded by runs that use the manifest
+            from services.batch_manifest import BatchManifest
+            manifest = BatchManifest(self.manifest_path())
+        try:
+            jobs, job_hashes, duplicates = self._plan(input_paths, manifest, force, report)
+            self._execute(jobs, job_hashes, duplicates, manifest, report, cancel_event)
+        finally:
+            if manifest is not None:
+                manifest.close()
+
+        cancelled = cancel_event is not None and cancel_event.is_set() and len(results) < len(input_paths) + len(conflicts)
+        results.sort(key=lambda result: result.input_path)
+        return BatchReport(results, time.perf_counter() - start, cancelled)
+
+    def _claim_outputs(self, input_paths: List[str]) -> Tuple[List[str], List[BatchItemResult]]:
+        """
+        Split inputs into those with an output file of their own and failures for the rest.
+
+        Inputs differing only in extension (a.jpg and a.png with output format
+        png) would write the same file; the first one keeps it. An output that
+        would replace one of the inputs fails as well.
+        """
+        def key(path: str) -> str:
+            return os.path.normcase(os.path.abspath(path))
+
+        inputs = {key(path): path for path in input_paths}
+        claimed = []
+        conflicts = []
+        owners: Dict[str, str] = {}
+        for path in input_paths:
+            output_path = key(self.output_path_for(path))
+            if output_path in inputs:
+                conflicts.append(BatchItemResult(path, None, f"output would overwrite the input {inputs[output_path]}", 0.0))
+            elif output_path in owners:
+                conflicts.append(BatchItemResult(path, None, f"same output file as {owners[output_path]}", 0.0))
+            else:
+                owners[output_path] = path
+                claimed.append(path)
+        return claimed, conflicts
+
+    def _plan(self, input_paths: List[str], manifest: Optional['BatchManifest'], force: bool,
+              report: Callable[[BatchItemResult], None]) -> Tuple[List[Tuple], Dict[str, str], Dict[str, List[Tuple[str, str]]]]:
+        """
+        Split inputs into jobs to run, their content hashes, and duplicates of their inputs.
+
+        Up-to-date outputs and outputs copied from an earlier run are reported
+        straight away. Duplicates map a job's input path to the (input, output)
+        pairs of identical files waiting for its output.
+        """
+        jobs = []
+        job_hashes: Dict[str, str] = {}
+        duplicates: Dict[str, List[Tuple[str, str]]] = {}
+        if manifest is None:
+            for path in input_paths:
+                jobs.append((path, self.output_path_for(path), self.recipe, self.tiled, self.encoder_preset))
+            return jobs, job_hashes, duplicates
+
+        recipe_hash = self._recipe_hash()
+        hashes = manifest.input_hashes(input_paths, self.workers)
+        first_with_hash: Dict[str, str] = {}
+        for path in input_paths:
+            output_path = self.output_path_for(path)
+            content_hash = hashes[os.path.abspath(path)]
+            if not force:
+                if manifest.is_current(content_hash, recipe_hash, output_path):
+                    report(BatchItemResult(path, output_path, None, 0.0, skipped=True))
+                    continue
+                existing = manifest.find_output(content_hash, recipe_hash, os.path.splitext(output_path)[1])
+                if existing is not None:
+                    report(self._copy_output(manifest, path, existing, output_path, content_hash))
+                    continue
+            if content_hash in first_with_hash:
+                duplicates.setdefault(first_with_hash[content_hash], []).append((path, output_path))
+                continue
+            first_with_hash[content_hash] = path
+            job_hashes[path] = content_hash
+            jobs.append((path, output_path, self.recipe, self.tiled, self.encoder_preset))
+        return jobs, job_hashes, duplicates
+
+    def _recipe_hash(self) -> str:
+        from services.batch_manifest import BatchManifest
+        return BatchManifest.recipe_hash(self.resolved_recipe(), **self.output_settings())
+
+    def resolved_recipe(self) -> Dict:
+        """The recipe with None placeholders replaced by the configured defaults they stand for"""
+        recipe = dict(self.recipe)
+        recipe['resize_filter'] = recipe['resize_filter'] or config.RESIZE_SETTINGS['filter']
+        recipe['blur_method'] = recipe['blur_method'] or config.BLUR_SETTINGS['export_method']
+        return recipe
+
+    def output_settings(self) -> Dict:
+        """Configuration besides the recipe that determines the output bytes"""
+        preset = self.encoder_preset or config.SAVE_SETTINGS['preset']
+        settings = {
+            'tiled': self.tiled,
+            'encoder_preset': preset,
+            'encoder_options': config.ENCODER_PRESETS.get(preset),
+            'reducing_gap': config.RESIZE_SETTINGS['reducing_gap']
+        }
+        if self.resolved_recipe()['blur_method'] == 'downsample':
+            settings['downsample'] = (config.BLUR_SETTINGS['downsample_min_radius'],
+                                      config.BLUR_SETTINGS['downsample_max_factor'])
+        if self.tiled:
+            settings['tiled_settings'] = config.TILED_SETTINGS
+        return settings
+
+    def _copy_output(self, manifest: 'BatchManifest', input_path: str, source_output: str,
+                     output_path: str, content_hash: str) -> BatchItemResult:
+        """Reuse the output of an identical input instead of processing again"""
+        start = time.perf_counter()
+        try:
+            if os.path.abspath(source_output) != os.path.abspath(output_path):
+                shutil.copyfile(source_output, output_path)
+            manifest.record(content_hash, self._recipe_hash(), output_path)
+            return BatchItemResult(input_path, output_path, None, time.perf_counter() - start, skipped=True)
+        except Exception as e:
+            return BatchItemResult(input_path, None, str(e), time.perf_counter() - start)
+
+    def _execute(self, jobs: List[Tuple], job_hashes: Dict[str, str], duplicates: Dict[str, List[Tuple[str, str]]],
+                 manifest: Optional['BatchManifest'], report: Callable[[BatchItemResult], None],
+                 cancel_event: Optional[threading.Event]):
+        """Run jobs inline or in worker processes, recording each finished output"""
+        def cancelled() -> bool:
+            return cancel_event is not None and cancel_event.is_set()
+
+        def finish(result: BatchItemResult):
+            waiting = duplicates.get(result.input_path, [])
+            if manifest is not None and result.ok:
+                content_hash = job_hashes[result.input_path]
+                try:
+                    manifest.record(content_hash, self._recipe_hash(), result.output_path)
+                except Exception as e:
+                    # e.g. the output vanished or the database stayed locked past the timeout
+                    result = result._replace(error=f"output not recorded in manifest: {e}")
+            finished = [result]
+            if manifest is not None and result.ok:
+                finished += [self._copy_output(manifest, path, result.output_path, output_path, content_hash)
+                             for path, output_path in waiting]
+            else:
+                # Identical inputs would fail the same way
+                finished += [BatchItemResult(path, None, result.error, 0.0) for path, _ in waiting]
+            for item in finished:
+                report(item)
+
+        if self.workers == 1 or len(jobs) <= 1:
+            for job in jobs:
+                if cancelled():
+                    break
+                finish(_process_file(*job))
+            return
+
+        # multiprocessing is imported here so the editor, which only lists files, starts faster
+        import multiprocessing
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        # Each process already has a core; band threads would only oversubscribe
+        context = multiprocessing.get_context(self.start_method) if self.start_method else None
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                 initializer=ParallelRenderer.set_worker_count, initargs=(1,)) as executor:
+            pending = {executor.submit(_process_file, *job) for job in jobs}
+            while pending:
+                if cancelled():
+                    for future in pending:
+                        future.cancel()
+                # Wake up regularly so a cancel is noticed while long files are running
+                done, pending = wait(pending, timeout=config.BATCH_SETTINGS['cancel_poll_seconds'],
+                                     return_when=FIRST_COMPLETED)
+                for future in done:
+                    if not future.cancelled():
+                        finish(future.result())
@@ -0,0 +1,176 @@
+import os
+import time
+from PIL import Image, ImageEnhance
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from services.blur_engine import PREMULTIPLIED_MODES, BlurEngine
+from services.enhancement_kernel import EnhancementKernel
+from services.parallel_renderer import ParallelRenderer
+from services.resize_engine import ResizeEngine
+import config
+
+# Modes a writer accepts where Pillow would raise instead of converting itself
+SAVE_MODES = {
+    'JPEG': ('RGB', 'L', 'CMYK'),
+    'BMP': ('1', 'L', 'P', 'RGB', 'RGBA')
+}
+
+class SaveResult(NamedTuple):
+    """Where an image was written, how long encoding took and the file size"""
+    file_path: str
+    encode_seconds: float
+    file_size: int
+
+class ImageOperations:
+    """Headless image operations that raise errors instead of showing dialogs"""
+
+    @staticmethod
+    def load_image(file_path: str, max_size: Optional[Tuple[int, int]] = None,
+                   reducing_gap: Optional[float] = None) -> Image.Image:
+        """
+        Load an image from file path, optionally shrinking it to fit max_size.
+
+        When shrinking, the decoder is asked for a reduced-size decode first
+        (Image.draft: JPEG DCT scaling by 1/2 to 1/8) and the remaining reduction
+        uses Image.reduce before resampling, so large sources are never decoded
+        at full resolution. reducing_gap trades quality for speed.
+        """
+        image = Image.open(file_path)
+        if max_size and (image.width > max_size[0] or image.height > max_size[1]):
+            if reducing_gap is None:
+                reducing_gap = config.LOAD_SETTINGS['reducing_gap']
+            # thumbnail() calls draft() with max_size * reducing_gap before decoding
+            image.thumbnail(max_size, reducing_gap=reducing_gap)
+        else:
+            image.load()
+        return image
+
+    @staticmethod
+    def read_size(file_path: str) -> Tuple[int, int]:
+        """Read an image's full-resolution size from its header without decoding"""
+        with Image.open(file_path) as image:
+            return image.size
+
+    @staticmethod
+    def apply_enhancements(image: Image.Image, contrast: float, brightness: float, blur: float) -> Image.Image:
+        """Apply contrast, brightness and blur enhancements to image"""
+        temp_image = ImageOperations.adjust_tone(image, contrast, brightness)
+        return ImageOperations.apply_blur(temp_image, blur)
+
+    @staticmethod
+    def adjust_tone(image: Image.Image, contrast: float, brightness: float) -> Image.Image:
+        """Apply contrast then brightness, fused into one pass where the mode allows"""
+        image = ImageOperations.editable(image)
+        if EnhancementKernel.supports(image):
+            if contrast == 1.0 and brightness == 1.0:
+                return image.copy()
+            if ParallelRenderer.should_split(image):
+                return ParallelRenderer.adjust_tone(image, contrast, brightness)
+            return EnhancementKernel.apply(image, contrast, brightness)
+        temp_image = ImageEnhance.Contrast(image).enhance(contrast)
+        return ImageEnhance.Brightness(temp_image).enhance(brightness)
+
+    @staticmethod
+    def apply_blur(image: Image.Image, blur: float, method: Optional[str] = None) -> Image.Image:
+        """
+        Apply a Gaussian blur; a radius of 0 returns the image unchanged.
+
+        method picks a BlurEngine path ('box', 'exact' or 'downsample') and
+        defaults to BLUR_SETTINGS['export_method'].
+        """
+        if blur <= 0:
+            return image
+        image = ImageOperations.editable(image)
+        method = method or config.BLUR_SETTINGS['export_method']
+        # The downsample grid depends on where a band starts, so it runs whole
+        if method != 'downsample' and ParallelRenderer.should_split(image):
+            return ParallelRenderer.map_bands(
+                image, BlurEngine.halo(blur, method), lambda band: BlurEngine.blur(band, blur, method)
+            )
+        return BlurEngine.blur(image, blur, method)
+
+    @staticmethod
+    def editable(image: Image.Image) -> Image.Image:
+        """Expand palette and bilevel images, which the enhance and filter code rejects"""
+        if image.mode == 'P':
+            return image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+        if image.mode == '1':
+            return image.convert('L')
+        return image
+
+    @staticmethod
+    def displayable(image: Image.Image) -> Image.Image:
+        """Expand grayscale with alpha for Tk, which shows 1, L, RGB and RGBA photos directly"""
+        return image.convert('RGBA') if image.mode == 'LA' else image
+
+    @staticmethod
+    def savable(image: Image.Image, image_format: Optional[str]) -> Image.Image:
+        """Expand or drop channels only as far as image_format's writer requires"""
+        modes = SAVE_MODES.get(image_format)
+        if modes is None or image.mode in modes:
+            return image
+        if image.mode == 'LA':
+            return image.convert('RGBA' if 'RGBA' in modes else 'L')
+        return image.convert('RGB')
+
+    @staticmethod
+    def fit_within(image: Image.Image, max_size: Tuple[int, int]) -> Image.Image:
+        """
+        Shrink image to fit max_size with the display filter; images that already fit are returned as-is.
+
+        Images with alpha skip the reduce step, as Image.thumbnail does, so the
+        display, proxy and thumbnails look exactly as they did with thumbnail().
+        """
+        if image.width <= max_size[0] and image.height <= max_size[1]:
+            return image
+        settings = config.RESIZE_SETTINGS
+        reducing_gap = None if image.mode in PREMULTIPLIED_MODES else settings['display_reducing_gap']
+        return ResizeEngine.resize(image, max_size, 'fit', settings['display_filter'], reducing_gap)
+
+    @staticmethod
+    def resize_image(image: Image.Image, width: int, height: int, mode: str = 'exact',
+                     filter_name: Optional[str] = None) -> Image.Image:
+        """
+        Resize image to width x height ('exact'), within it keeping the aspect
+        ratio ('fit') or covering it with a centred crop ('fill').
+
+        filter_name is a RESAMPLE_FILTERS key and defaults to RESIZE_SETTINGS['filter'].
+        """
+        return ResizeEngine.resize(ImageOperations.editable(image), (width, height), mode, filter_name)
+
+    @staticmethod
+    def convert_to_grayscale(image: Image.Image) -> Image.Image:
+        """
+        Convert image to single-channel grayscale (L), or LA when it has alpha.
+
+        The result stays one channel through tone, blur, undo and caching, and
+        is only expanded where a display or file format needs it.
+        """
+        image = ImageOperations.editable(image)
+        if image.mode in ('L', 'LA'):
+            return image.copy()
+        return image.convert('LA' if 'A' in image.getbands() else 'L')
+
+    @staticmethod
+    def encoder_options(file_path: str, preset: Optional[str] = None,
+                        overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Encoder keyword arguments for file_path's format from an ENCODER_PRESETS entry.
+
+        overrides (e.g. {'quality': 70}) are applied on top of the preset.
+        """
+        preset = preset or config.SAVE_SETTINGS['preset']
+        if preset not in config.ENCODER_PRESETS:
+            raise ValueError(f"Unknown encoder preset '{preset}'")
+        image_format = Image.registered_extensions().get(os.path.splitext(file_path)[1].lower())
+        options = dict(config.ENCODER_PRESETS[preset].get(image_format, {}))
+        options.update(overrides or {})
+        return options
+
+    @staticmethod
+    def save_image(image: Image.Image, file_path: str, **save_options) -> SaveResult:
+        """Save image to file, converting only modes the format cannot store"""
+        extension = os.path.splitext(file_path)[1].lower()
+        image = ImageOperations.savable(image, Image.registered_extensions().get(extension))
+        start = time.perf_counter()
+        image.save(file_path, **save_options)
+        return SaveResult(file_path, time.perf_counter() - start, os.path.getsize(file_path))
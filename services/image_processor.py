@@ -1,19 +1,24 @@
-from PIL import Image, ImageEnhance, ImageFilter, ImageOps, ImageTk
-from tkinter import filedialog
+from PIL import Image, ImageTk
 import tkinter.messagebox
-from typing import Optional, Tuple
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+from models.recipe import Recipe
+from services.image_operations import ImageOperations, SaveResult
+from utils.profiler import Profiler
 import config
 
+if TYPE_CHECKING:
+    from services.rendition_export import RenditionExporter, RenditionReport
+
 class ImageProcessor:
     """Service class for image processing operations"""
     
     @staticmethod
-    def load_image(file_path: str) -> Optional[Image.Image]:
-        """Load an image from file path"""
+    @Profiler.timed()
+    def load_image(file_path: str, max_size: Optional[Tuple[int, int]] = config.MAX_IMAGE_SIZE) -> Optional[Image.Image]:
+        """Load an image from file path; pass max_size=None to keep full resolution"""
         try:
-            image = Image.open(file_path)
-            image.thumbnail(config.MAX_IMAGE_SIZE)
-            return image
+            return ImageOperations.load_image(file_path, max_size)
         except Exception as e:
             tkinter.messagebox.showerror("Error", f"Error opening image: {str(e)}")
             return None
@@ -21,49 +26,86 @@ class ImageProcessor:
     @staticmethod
     def open_image_dialog() -> Optional[str]:
         """Open file dialog to select image"""
+        from tkinter import filedialog
         return filedialog.askopenfilename(
             title="Select an Image",
             filetypes=config.IMAGE_FILE_TYPES
         )
     
+    @staticmethod
+    def open_folder_dialog(title: str = "Select a Folder") -> Optional[str]:
+        """Open dialog to select a folder"""
+        from tkinter import filedialog
+        return filedialog.askdirectory(title=title)
+    
     @staticmethod
     def save_image_dialog() -> Optional[str]:
         """Open save dialog for image"""
+        from tkinter import filedialog
         return filedialog.asksaveasfilename(
             defaultextension=".jpg",
             filetypes=config.SAVE_FILE_TYPES
         )
     
     @staticmethod
+    def save_recipe_dialog() -> Optional[str]:
+        """Open save dialog for an edit recipe"""
+        from tkinter import filedialog
+        return filedialog.asksaveasfilename(
+            title="Save Recipe",
+            defaultextension=".json",
+            filetypes=config.RECIPE_FILE_TYPES
+        )
+    
+    @staticmethod
+    def open_images_dialog() -> Tuple[str, ...]:
+        """Open file dialog to select several images"""
+        from tkinter import filedialog
+        return filedialog.askopenfilenames(
+            title="Select Images",
+            filetypes=config.IMAGE_FILE_TYPES
+        )
+    
+    @staticmethod
+    def save_recipe(params: Dict[str, Any], file_path: str) -> bool:
+        """Write an edit recipe to file"""
+        try:
+            Recipe.save(params, file_path)
+            tkinter.messagebox.showinfo("Success", "Recipe saved successfully!")
+            return True
+        except Exception as e:
+            tkinter.messagebox.showerror("Error", f"Error saving recipe: {str(e)}")
+            return False
+    
+    @staticmethod
+    @Profiler.timed()
     def apply_enhancements(image: Image.Image, contrast: float, brightness: float, blur: float) -> Image.Image:
         """Apply contrast, brightness and blur enhancements to image"""
         try:
-            temp_image = image.copy()
-            temp_image = ImageEnhance.Contrast(temp_image).enhance(contrast)
-            temp_image = ImageEnhance.Brightness(temp_image).enhance(brightness)
-            if blur > 0:
-                temp_image = temp_image.filter(ImageFilter.GaussianBlur(blur))
-            return temp_image
+            return ImageOperations.apply_enhancements(image, contrast, brightness, blur)
         except Exception as e:
             tkinter.messagebox.showerror("Error", f"Error applying enhancements: {str(e)}")
             return image
     
     @staticmethod
+    @Profiler.timed()
     def create_display_image(image: Image.Image) -> ImageTk.PhotoImage:
         """Create a PhotoImage for display"""
         try:
-            display_temp = image.copy()
-            display_temp.thumbnail(config.MAX_IMAGE_SIZE)
-            return ImageTk.PhotoImage(display_temp)
+            with Profiler.stage('display.thumbnail'):
+                display_temp = ImageOperations.displayable(ImageOperations.fit_within(image, config.MAX_IMAGE_SIZE))
+            with Profiler.stage('display.photoimage'):
+                return ImageTk.PhotoImage(display_temp)
         except Exception as e:
             tkinter.messagebox.showerror("Error", f"Error creating display image: {str(e)}")
             return None
     
     @staticmethod
-    def save_image(image: Image.Image, file_path: str) -> bool:
+    @Profiler.timed()
+    def save_image(image: Image.Image, file_path: str, **save_options) -> bool:
         """Save image to file"""
         try:
-            image.save(file_path)
+            ImageOperations.save_image(image, file_path, **save_options)
             tkinter.messagebox.showinfo("Success", "Image saved successfully!")
             return True
         except Exception as e:
@@ -71,24 +113,51 @@ class ImageProcessor:
             return False
     
     @staticmethod
+    @Profiler.timed()
+    def render_and_save(render: Callable[[], Image.Image], file_path: str,
+                        **save_options) -> Tuple[float, SaveResult]:
+        """
+        Render and encode an export, returning the render time and the save result.
+
+        Meant to run off the Tk thread, so errors are raised rather than shown.
+        """
+        start = time.perf_counter()
+        image = render()
+        render_seconds = time.perf_counter() - start
+        return render_seconds, ImageOperations.save_image(image, file_path, **save_options)
+    
+    @staticmethod
+    @Profiler.timed()
+    def render_and_export_renditions(render: Callable[[], Image.Image], exporter: 'RenditionExporter',
+                                     output_dir: str, stem: str) -> 'RenditionReport':
+        """
+        Render an export once and write all of exporter's sizes and formats.
+
+        Meant to run off the Tk thread, so errors are raised rather than shown.
+        """
+        start = time.perf_counter()
+        image = render()
+        return exporter.export(image, output_dir, stem, render_seconds=time.perf_counter() - start)
+    
+    @staticmethod
+    @Profiler.timed()
     def resize_image(image: Image.Image, width: int, height: int) -> Optional[Image.Image]:
         """Resize image to specified dimensions"""
         try:
-            if width > 0 and height > 0:
-                return image.resize((width, height))
-            else:
-                tkinter.messagebox.showerror("Error", "Width and height must be positive numbers.")
-                return None
+            return ImageOperations.resize_image(image, width, height)
+        except ValueError as e:
+            tkinter.messagebox.showerror("Error", str(e))
+            return None
         except Exception as e:
             tkinter.messagebox.showerror("Error", f"Error resizing image: {str(e)}")
             return None
     
     @staticmethod
+    @Profiler.timed()
     def convert_to_grayscale(image: Image.Image) -> Optional[Image.Image]:
         """Convert image to grayscale"""
         try:
-            # Convert to grayscale - need to convert back to RGB mode for further editing
-            return ImageOps.grayscale(image).convert('RGB')
+            return ImageOperations.convert_to_grayscale(image)
         except Exception as e:
             tkinter.messagebox.showerror("Error", f"Error converting to grayscale: {str(e)}")
             return None
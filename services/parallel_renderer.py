@@ -0,0 +1,87 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from typing import Callable, List, Optional, Tuple
+from services.enhancement_kernel import EnhancementKernel
+import config
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+_worker_override: Optional[int] = None
+
+class ParallelRenderer:
+    """
+    Renders one large image on several cores by splitting it into horizontal bands.
+
+    Pillow releases the GIL inside point() and the blur filters, so bands run
+    concurrently on a shared thread pool. Bands for the blur carry enough extra
+    rows for the filter to see the same neighbours as a whole-image render, and
+    the contrast mean is computed once for the whole image and shared by every
+    band, so the stitched result is identical to the single-threaded one.
+    """
+
+    @staticmethod
+    def worker_count() -> int:
+        """Threads used per image: an override, PARALLEL_SETTINGS or the CPU count"""
+        return _worker_override or config.PARALLEL_SETTINGS['workers'] or os.cpu_count() or 1
+
+    @staticmethod
+    def set_worker_count(workers: Optional[int]):
+        """Override the thread count, e.g. 1 inside batch worker processes"""
+        global _worker_override
+        _worker_override = workers
+
+    @staticmethod
+    def should_split(image: Image.Image) -> bool:
+        """Split only when there are cores to use and the image is worth it"""
+        return (ParallelRenderer.worker_count() > 1
+                and image.width * image.height >= config.PARALLEL_SETTINGS['min_pixels'])
+
+    @staticmethod
+    def band_bounds(height: int, count: int) -> List[Tuple[int, int]]:
+        """Split height rows into count nearly equal (top, bottom) ranges"""
+        count = max(1, min(count, height))
+        return [(height * index // count, height * (index + 1) // count) for index in range(count)]
+
+    @staticmethod
+    def map_bands(image: Image.Image, halo: int,
+                  render_band: Callable[[Image.Image], Image.Image]) -> Image.Image:
+        """Render overlapping bands concurrently and stitch the trimmed results"""
+        width, height = image.size
+        jobs = []
+        for top, bottom in ParallelRenderer.band_bounds(height, ParallelRenderer.worker_count()):
+            context_top, context_bottom = max(0, top - halo), min(height, bottom + halo)
+            jobs.append((top, bottom, context_top, context_bottom))
+
+        def run(job):
+            top, bottom, context_top, context_bottom = job
+            band = render_band(image.crop((0, context_top, width, context_bottom)))
+            return band.crop((0, top - context_top, width, bottom - context_top))
+
+        bands = list(ParallelRenderer._pool().map(run, jobs))
+        result = Image.new(bands[0].mode, (width, height))
+        for (top, _, _, _), band in zip(jobs, bands):
+            result.paste(band, (0, top))
+        return result
+
+    @staticmethod
+    def adjust_tone(image: Image.Image, contrast: float, brightness: float) -> Image.Image:
+        """Fused contrast + brightness with one shared mean and lookup table"""
+        mean = EnhancementKernel.image_mean(image) if contrast != 1.0 else 0
+        table = EnhancementKernel.band_lut(image, EnhancementKernel.build_lut(mean, contrast, brightness))
+        return ParallelRenderer.map_bands(image, 0, lambda band: band.point(table))
+
+    @staticmethod
+    def _pool() -> ThreadPoolExecutor:
+        """Shared thread pool, recreated if the worker count changes"""
+        global _executor, _executor_workers
+        workers = ParallelRenderer.worker_count()
+        with _executor_lock:
+            if _executor is None or _executor_workers != workers:
+                if _executor is not None:
+                    _executor.shutdown(wait=False)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="band-render")
+                _executor_workers = workers
+            return _executor
@@ -0,0 +1,152 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from PIL import Image
+from typing import Callable, Dict, Optional, Tuple
+import config
+
+# magic, mode, raw mode, width, height; padded to 32 bytes
+_HEADER = struct.Struct('<4s8s8sII')
+_HEADER_SIZE = 32
+_MAGIC = b'PXC1'
+
+# Cached modes and their raw layouts. Pillow maps L, RGBA, CMYK and I;16 in
+# place; RGB and LA are unpacked from the mapping with one copy (a mapped RGBX
+# buffer would come back as an RGBX image, which the pipeline does not take)
+RAW_MODES = {'L': 'L', 'RGB': 'RGB', 'RGBA': 'RGBA', 'CMYK': 'CMYK', 'LA': 'LA', 'I;16': 'I;16'}
+
+class PixelCache:
+    """
+    On-disk cache of decoded pixels, read back through memory maps.
+
+    Entries are raw pixel files keyed by the source's path, mtime, size and the
+    requested decode size, so reopening a recently edited image maps its pixels
+    with Image.frombuffer instead of decoding the file. Entries are written to a
+    temporary name and renamed into place and carry a header that is checked
+    on read, so several editor instances can share the directory. A hit
+    refreshes the entry's mtime; when the directory exceeds its byte budget the
+    least recently used entries are deleted, by whichever instance notices.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, budget_bytes: Optional[int] = None):
+        settings = config.PIXEL_CACHE_SETTINGS
+        self.cache_dir = cache_dir or settings['cache_dir'] or self.default_cache_dir()
+        self.budget_bytes = settings['budget_bytes'] if budget_bytes is None else budget_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def default_cache_dir() -> str:
+        """$XDG_CACHE_HOME/parametria/pixels, falling back to ~/.cache"""
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(base, 'parametria', 'pixels')
+
+    def entry_path(self, file_path: str, max_size: Optional[Tuple[int, int]]) -> str:
+        stat = os.stat(file_path)
+        key = repr((os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size,
+                    tuple(max_size) if max_size else None))
+        return os.path.join(self.cache_dir, hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + '.px')
+
+    def get(self, file_path: str, max_size: Optional[Tuple[int, int]] = None) -> Optional[Image.Image]:
+        """Map the cached pixels of file_path decoded for max_size, or None"""
+        try:
+            entry = self.entry_path(file_path, max_size)
+            image = self._map(entry)
+        except (OSError, ValueError, struct.error):
+            image = None
+        with self._lock:
+            if image is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return image
+
+    @staticmethod
+    def _map(entry: str) -> Image.Image:
+        with open(entry, 'rb') as f:
+            # The mapping outlives the file object and, on POSIX, an eviction of the file
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, mode, raw_mode, width, height = _HEADER.unpack_from(mapping)
+        mode, raw_mode = mode.rstrip(b'\0').decode(), raw_mode.rstrip(b'\0').decode()
+        if magic != _MAGIC or RAW_MODES.get(mode) != raw_mode:
+            raise ValueError(f"{entry} is not a pixel cache entry")
+        # Mappable layouts share the read-only mapping (Pillow copies before any
+        # in-place change); the others are copied here
+        return Image.frombuffer(mode, (width, height), memoryview(mapping)[_HEADER_SIZE:],
+                                'raw', raw_mode, 0, 1)
+
+    def put(self, file_path: str, max_size: Optional[Tuple[int, int]], image: Image.Image) -> bool:
+        """Store image as the decode of file_path for max_size; returns whether it was stored"""
+        raw_mode = RAW_MODES.get(image.mode)
+        if raw_mode is None:
+            return False
+        data = image.tobytes('raw', raw_mode)
+        if len(data) + _HEADER_SIZE > self.budget_bytes:
+            return False
+        try:
+            entry = self.entry_path(file_path, max_size)
+        except OSError:
+            return False
+        temporary = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            header = _HEADER.pack(_MAGIC, image.mode.encode(), raw_mode.encode(), image.width, image.height)
+            with open(temporary, 'wb') as f:
+                f.write(header.ljust(_HEADER_SIZE, b'\0'))
+                f.write(data)
+            os.replace(temporary, entry)
+        except OSError:
+            # A read-only or full cache only costs the next open a decode
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            return False
+        self.evict()
+        return True
+
+    def load(self, file_path: str, max_size: Optional[Tuple[int, int]],
+             decode: Callable[[str, Optional[Tuple[int, int]]], Image.Image]) -> Image.Image:
+        """Cached pixels of file_path, decoding with decode(file_path, max_size) and storing on a miss"""
+        image = self.get(file_path, max_size)
+        if image is None:
+            image = decode(file_path, max_size)
+            self.put(file_path, max_size, image)
+        return image
+
+    def evict(self):
+        """Delete least recently used entries until the directory fits the budget"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.px'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, name))
+            total += stat.st_size
+        entries.sort()
+        for _, size, name in entries:
+            if total <= self.budget_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                # Already evicted by another instance, or still mapped on Windows
+                continue
+            total -= size
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
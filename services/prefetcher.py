@@ -0,0 +1,108 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from PIL import Image
+from typing import Callable, Dict, List, Optional
+from models.render_cache import RenderCache
+import config
+
+class ImagePrefetcher:
+    """
+    Decodes the neighbours of the current image in the background.
+
+    Decoded images are kept in a RenderCache bounded by PREFETCH_SETTINGS'
+    budget_bytes and keyed by path, mtime and size, so an edited file is
+    decoded again. get() returns a cached image at once, waits for a decode
+    that is already running, or decodes synchronously as a last resort.
+    Returned images are shared and must not be modified in place.
+    """
+
+    def __init__(self, load_fn: Callable[[str], Image.Image], budget_bytes: Optional[int] = None,
+                 workers: Optional[int] = None):
+        settings = config.PREFETCH_SETTINGS
+        self.load_fn = load_fn
+        self.cache = RenderCache(settings['budget_bytes'] if budget_bytes is None else budget_bytes)
+        self._executor = ThreadPoolExecutor(max_workers=workers or settings['workers'],
+                                            thread_name_prefix="prefetch")
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.waits = 0
+
+    @staticmethod
+    def _key(file_path: str) -> str:
+        stat = os.stat(file_path)
+        return repr((os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size))
+
+    def get(self, file_path: str) -> Image.Image:
+        """Return the decoded image, from the cache or a running prefetch if possible"""
+        key = self._key(file_path)
+        with self._lock:
+            image = self.cache.get(key)
+            future = self._futures.get(key) if image is None else None
+        if image is not None:
+            return image
+        if future is not None:
+            if not future.cancel():
+                self.waits += 1
+                return future.result()
+            # Not started yet: decode here rather than wait behind other prefetches
+            with self._lock:
+                self._futures.pop(key, None)
+        image = self.load_fn(file_path)
+        self.cache.put(key, image)
+        return image
+
+    def prefetch(self, file_paths: List[str]):
+        """
+        Decode file_paths in order in the background.
+
+        Queued decodes of paths no longer listed are cancelled, so rapid
+        navigation does not build a backlog.
+        """
+        wanted = {}
+        for file_path in file_paths:
+            try:
+                wanted[self._key(file_path)] = file_path
+            except OSError:
+                continue
+        with self._lock:
+            for key, future in list(self._futures.items()):
+                if key not in wanted and future.cancel():
+                    del self._futures[key]
+            for key, file_path in wanted.items():
+                if key not in self._futures and not self.cache.contains(key):
+                    self._futures[key] = self._executor.submit(self._load, key, file_path)
+
+    def _load(self, key: str, file_path: str) -> Image.Image:
+        try:
+            image = self.load_fn(file_path)
+            self.cache.put(key, image)
+            return image
+        finally:
+            with self._lock:
+                self._futures.pop(key, None)
+
+    def stats(self) -> Dict[str, float]:
+        """Lookups served from the cache, from a running prefetch, or decoded on demand"""
+        lookups = self.cache.hits + self.cache.misses
+        return {
+            'hits': self.cache.hits,
+            'in_flight': self.waits,
+            'misses': self.cache.misses - self.waits,
+            'hit_rate': (self.cache.hits + self.waits) / lookups if lookups else 0.0,
+            'evictions': self.cache.evictions,
+            'bytes': self.cache.bytes_used
+        }
+
+    @staticmethod
+    def neighbours(file_paths: List[str], index: int, count: int) -> List[str]:
+        """Up to count images either side of index, nearest first, next before previous"""
+        order = []
+        for distance in range(1, count + 1):
+            for neighbour in (index + distance, index - distance):
+                if 0 <= neighbour < len(file_paths):
+                    order.append(file_paths[neighbour])
+        return order
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,120 @@
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from PIL import Image
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from models.edit_pipeline import EditPipeline
+from services.image_operations import ImageOperations
+from services.resize_engine import ResizeEngine
+import config
+
+class RenditionResult(NamedTuple):
+    """One encoded rendition: its size class, pixel size and where it was written"""
+    max_side: int
+    image_size: Tuple[int, int]
+    file_path: str
+    encode_seconds: float
+    file_size: int
+
+class RenditionReport(NamedTuple):
+    """Written renditions plus the time spent rendering, downscaling and overall"""
+    results: List[RenditionResult]
+    skipped_sizes: List[int]
+    render_seconds: float
+    resize_seconds: float
+    elapsed: float
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(result.file_size for result in self.results)
+
+class RenditionExporter:
+    """
+    Writes an edited image at several sizes and formats (e.g. for srcset).
+
+    The edit is rendered once at full resolution; each size is then
+    downscaled from the next larger rendition rather than from the full
+    image (cascade), with its pixel size still computed from the full image
+    so rounding does not drift. As soon as a rendition exists its formats are
+    encoded on a thread pool, overlapping with the next downscale (Pillow's
+    encoders release the GIL). Each encode gets its own copy of the rendition,
+    since Image.save keeps the call's options on the image object while it
+    runs. Sizes are longest sides; sizes larger than the
+    image are skipped rather than upscaled. Defaults come from RENDITION_SETTINGS.
+    """
+
+    def __init__(self, sizes: Optional[Sequence[int]] = None, formats: Optional[Sequence[str]] = None,
+                 encoder_preset: Optional[str] = None, workers: Optional[int] = None,
+                 filter_name: Optional[str] = None):
+        settings = config.RENDITION_SETTINGS
+        self.sizes = sorted(set(sizes or settings['sizes']), reverse=True)
+        if not self.sizes or self.sizes[-1] <= 0:
+            raise ValueError("Rendition sizes must be positive numbers.")
+        self.formats = [extension.lower().lstrip('.') for extension in (formats or settings['formats'])]
+        unknown = [extension for extension in self.formats
+                   if '.' + extension not in Image.registered_extensions()]
+        if unknown:
+            raise ValueError(f"Unknown rendition format(s): {', '.join(unknown)}")
+        self.encoder_preset = encoder_preset
+        self.workers = workers or settings['workers'] or os.cpu_count() or 1
+        self.filter_name = filter_name or settings['filter']
+
+    def output_path_for(self, output_dir: str, stem: str, max_side: int, extension: str) -> str:
+        name = config.RENDITION_SETTINGS['name_pattern'].format(stem=stem, size=max_side, ext=extension)
+        return os.path.join(output_dir, name)
+
+    def renditions(self, image: Image.Image):
+        """Yield (max_side, image) from the largest size down, each downscaled from the previous one"""
+        source = image
+        for max_side in self.sizes:
+            if max_side > max(image.size):
+                continue
+            size = ResizeEngine.target(image.size, (max_side, max_side), 'fit')[0]
+            if size != source.size:
+                source = ResizeEngine.resize(source, size, 'exact', self.filter_name)
+            yield max_side, source
+
+    def export(self, image: Image.Image, output_dir: str, stem: str,
+               progress_callback: Optional[Callable[[RenditionResult], None]] = None,
+               render_seconds: float = 0.0) -> RenditionReport:
+        """Write every size and format of an already rendered image into output_dir"""
+        os.makedirs(output_dir, exist_ok=True)
+        start = time.perf_counter()
+        resize_seconds = 0.0
+        written = set()
+        futures: List[Future] = []
+
+        def report(done: Future):
+            if done.exception() is None:
+                progress_callback(done.result())
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="rendition") as pool:
+            resize_start = time.perf_counter()
+            for max_side, rendition in self.renditions(image):
+                resize_seconds += time.perf_counter() - resize_start
+                written.add(max_side)
+                for extension in self.formats:
+                    file_path = self.output_path_for(output_dir, stem, max_side, extension)
+                    future = pool.submit(self._encode, rendition.copy(), max_side, file_path)
+                    if progress_callback is not None:
+                        future.add_done_callback(report)
+                    futures.append(future)
+                resize_start = time.perf_counter()
+            # Raises the first encoding error after the remaining encodes finish
+            results = [future.result() for future in futures]
+        skipped = [max_side for max_side in self.sizes if max_side not in written]
+        return RenditionReport(results, skipped, render_seconds, resize_seconds,
+                               render_seconds + time.perf_counter() - start)
+
+    def _encode(self, image: Image.Image, max_side: int, file_path: str) -> RenditionResult:
+        options = ImageOperations.encoder_options(file_path, self.encoder_preset)
+        saved = ImageOperations.save_image(image, file_path, **options)
+        return RenditionResult(max_side, image.size, saved.file_path, saved.encode_seconds, saved.file_size)
+
+    def export_file(self, input_path: str, recipe: Dict, output_dir: str,
+                    progress_callback: Optional[Callable[[RenditionResult], None]] = None) -> RenditionReport:
+        """Decode input_path once at full resolution, apply recipe and export its renditions"""
+        start = time.perf_counter()
+        image = EditPipeline(ImageOperations.load_image(input_path), cache_bytes=0).render(recipe)
+        stem = os.path.splitext(os.path.basename(input_path))[0]
+        return self.export(image, output_dir, stem, progress_callback, time.perf_counter() - start)
@@ -0,0 +1,143 @@
+import math
+from PIL import Image
+from typing import NamedTuple, Optional, Tuple
+from services.blur_engine import PREMULTIPLIED_MODES
+import config
+
+RESAMPLE_FILTERS = {
+    'nearest': Image.Resampling.NEAREST,
+    'bilinear': Image.Resampling.BILINEAR,
+    'bicubic': Image.Resampling.BICUBIC,
+    'lanczos': Image.Resampling.LANCZOS
+}
+
+# Radius of each filter in source pixels at scale 1
+FILTER_SUPPORT = {'nearest': 0.5, 'bilinear': 1.0, 'bicubic': 2.0, 'lanczos': 3.0}
+
+RESIZE_MODES = ('exact', 'fit', 'fill')
+
+_UNSET = object()
+
+class ResizePlan(NamedTuple):
+    """How a resize runs: reduce by integer factors first, then resample a source box"""
+    size: Tuple[int, int]
+    box: Tuple[float, float, float, float]
+    filter: str
+    factors: Tuple[int, int]
+    reduce_box: Tuple[int, int, int, int]
+
+    @property
+    def reduced_box(self) -> Tuple[float, float, float, float]:
+        """The resampled box in the coordinates of the reduced image"""
+        factor_x, factor_y = self.factors
+        return (
+            (self.box[0] - self.reduce_box[0]) / factor_x,
+            (self.box[1] - self.reduce_box[1]) / factor_y,
+            (self.box[2] - self.reduce_box[0]) / factor_x,
+            (self.box[3] - self.reduce_box[1]) / factor_y
+        )
+
+    def is_identity(self, source_size: Tuple[int, int]) -> bool:
+        return self.size == tuple(source_size) and self.box == (0, 0) + tuple(source_size)
+
+class ResizeEngine:
+    """
+    Resizes with a chosen filter and sizing mode.
+
+    * exact - stretch to the requested width and height
+    * fit   - largest size with the source's aspect ratio inside width x height
+    * fill  - cover width x height, cropping the overflow evenly from both sides
+
+    Large downscales first shrink by whole factors with Image.reduce (a box
+    average) until the remaining resample step is at most reducing_gap times,
+    then run the chosen filter; a gap of 2-3 is visually lossless and much
+    faster than filtering the full source. Unlike Pillow's own reducing_gap,
+    the reduce step also applies to images with alpha (premultiplied first).
+    The default filter and gap come from RESIZE_SETTINGS.
+    """
+
+    @staticmethod
+    def resample(filter_name: str) -> Image.Resampling:
+        if filter_name not in RESAMPLE_FILTERS:
+            raise ValueError(f"Unknown resize filter '{filter_name}', expected one of {', '.join(RESAMPLE_FILTERS)}")
+        return RESAMPLE_FILTERS[filter_name]
+
+    @staticmethod
+    def target(source_size: Tuple[int, int], size: Tuple[int, int],
+               mode: str = 'exact') -> Tuple[Tuple[int, int], Tuple[float, float, float, float]]:
+        """Output size and the source box it is resampled from"""
+        source_width, source_height = source_size
+        width, height = size
+        if width <= 0 or height <= 0:
+            raise ValueError("Width and height must be positive numbers.")
+        if mode == 'exact':
+            return (width, height), (0, 0, source_width, source_height)
+        if mode == 'fit':
+            scale = min(width / source_width, height / source_height)
+            fitted = (max(1, round(source_width * scale)), max(1, round(source_height * scale)))
+            return fitted, (0, 0, source_width, source_height)
+        if mode == 'fill':
+            scale = max(width / source_width, height / source_height)
+            crop_width, crop_height = width / scale, height / scale
+            left, top = (source_width - crop_width) / 2, (source_height - crop_height) / 2
+            return (width, height), (left, top, left + crop_width, top + crop_height)
+        raise ValueError(f"Unknown resize mode '{mode}', expected one of {', '.join(RESIZE_MODES)}")
+
+    @staticmethod
+    def plan(source_size: Tuple[int, int], size: Tuple[int, int], mode: str = 'exact',
+             filter_name: Optional[str] = None, reducing_gap=_UNSET) -> ResizePlan:
+        """Work out a resize; reducing_gap=None disables the reduce step"""
+        settings = config.RESIZE_SETTINGS
+        filter_name = filter_name or settings['filter']
+        ResizeEngine.resample(filter_name)
+        if reducing_gap is _UNSET:
+            reducing_gap = settings['reducing_gap']
+        size, box = ResizeEngine.target(source_size, size, mode)
+
+        factors = (1, 1)
+        if reducing_gap and filter_name != 'nearest':
+            factors = (max(1, int((box[2] - box[0]) / size[0] / reducing_gap)),
+                       max(1, int((box[3] - box[1]) / size[1] / reducing_gap)))
+        reduce_box = (0, 0) + tuple(source_size)
+        if factors != (1, 1):
+            # Only the source the filter reaches is reduced (Image._get_safe_box)
+            support = FILTER_SUPPORT[filter_name] - 0.5
+            support_x = support * (box[2] - box[0]) / size[0]
+            support_y = support * (box[3] - box[1]) / size[1]
+            reduce_box = (max(0, int(box[0] - support_x)), max(0, int(box[1] - support_y)),
+                          min(source_size[0], math.ceil(box[2] + support_x)),
+                          min(source_size[1], math.ceil(box[3] + support_y)))
+        return ResizePlan(size, box, filter_name, factors, reduce_box)
+
+    @staticmethod
+    def resize(image: Image.Image, size: Tuple[int, int], mode: str = 'exact',
+               filter_name: Optional[str] = None, reducing_gap=_UNSET) -> Image.Image:
+        """Resize image to size with the given mode and filter (default from RESIZE_SETTINGS)"""
+        return ResizeEngine.apply(image, ResizeEngine.plan(image.size, size, mode, filter_name, reducing_gap))
+
+    @staticmethod
+    def apply(image: Image.Image, plan: ResizePlan) -> Image.Image:
+        """Run a plan on an image whose size is the plan's source size"""
+        if plan.is_identity(image.size):
+            return image.copy()
+        return ResizeEngine.run(image, plan.size, plan.filter, plan.factors, plan.reduce_box, plan.reduced_box)
+
+    @staticmethod
+    def run(image: Image.Image, size: Tuple[int, int], filter_name: str, factors: Tuple[int, int],
+            reduce_box: Tuple[int, int, int, int], box: Tuple[float, float, float, float]) -> Image.Image:
+        """
+        Reduce reduce_box of image by factors, then resample box of the reduced
+        image to size. TiledProcessor calls this per band with band coordinates.
+        """
+        if image.mode in ('1', 'P'):
+            # Pillow only resamples palette and bilevel images with NEAREST, unreduced
+            factor_x, factor_y = factors
+            box = (reduce_box[0] + box[0] * factor_x, reduce_box[1] + box[1] * factor_y,
+                   reduce_box[0] + box[2] * factor_x, reduce_box[1] + box[3] * factor_y)
+            return image.resize(size, Image.Resampling.NEAREST, box=box)
+        premultiplied = PREMULTIPLIED_MODES.get(image.mode) if filter_name != 'nearest' else None
+        work = image.convert(premultiplied) if premultiplied else image
+        if factors != (1, 1):
+            work = work.reduce(factors, box=reduce_box)
+        result = work.resize(size, ResizeEngine.resample(filter_name), box=box)
+        return result.convert(image.mode) if premultiplied else result
@@ -0,0 +1,269 @@
+import io
+import os
+import struct
+import zlib
+from PIL import Image, TiffImagePlugin, TiffTags
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import config
+
+# TIFF tags a strip needs to decode: layout, compression, colour and predictor
+STRIP_DECODE_TAGS = (256, 258, 259, 262, 266, 277, 284, 317, 320, 338, 339, 347, 529, 530, 531, 532)
+
+class TiffStrips(NamedTuple):
+    """Where the compressed strips of a TIFF are, plus the tags that decode them"""
+    rows_per_strip: int
+    offsets: Tuple[int, ...]
+    byte_counts: Tuple[int, ...]
+    tags: Dict[int, Tuple]
+
+class BandReader:
+    """
+    Reads horizontal bands of rows from an image file.
+
+    Uncompressed sources whose pixel data Pillow exposes as raw tiles (plain and
+    striped TIFF, PPM/PGM, BMP) are read band by band straight from the file.
+    Compressed striped TIFFs (LZW, deflate, PackBits, JPEG) are read by
+    wrapping the strips a band covers in a small TIFF of their own, which
+    Pillow decodes. Either way memory stays proportional to the band. Any
+    other source (PNG, JPEG, tiled or single-strip TIFF) is decoded once in
+    full and cropped; check `streaming` to tell the two apart.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with Image.open(file_path) as image:
+            self.size: Tuple[int, int] = image.size
+            self.mode: str = image.mode
+            self.format: Optional[str] = image.format
+            self.info = dict(image.info)
+            self._tiles = self._raw_tiles(image)
+            self._strips = None if self._tiles else self._compressed_strips(image)
+            # getpalette loads the image, so the tiles are described first
+            self._palette = image.getpalette() if image.mode == 'P' else None
+        if self._strips is not None and not self._strips_decode():
+            self._strips = None
+        self.streaming = self._tiles is not None or self._strips is not None
+        self._image: Optional[Image.Image] = None
+
+    def _raw_tiles(self, image: Image.Image) -> Optional[List[Tuple]]:
+        """Describe each raw tile as (box, offset, rawmode, stride, orientation)"""
+        tiles = []
+        for tile in image.tile:
+            codec, box, offset, args = tile[0], tile[1], tile[2], tile[3]
+            if codec != 'raw':
+                return None
+            if isinstance(args, str):
+                args = (args, 0, 1)
+            rawmode = args[0]
+            stride = args[1] if len(args) > 1 else 0
+            orientation = args[2] if len(args) > 2 else 1
+            if not stride:
+                try:
+                    stride = len(Image.new(image.mode, (box[2] - box[0], 1)).tobytes('raw', rawmode))
+                except Exception:
+                    return None
+            tiles.append((box, offset, rawmode, stride, orientation))
+        return tiles or None
+
+    @staticmethod
+    def _compressed_strips(image: Image.Image) -> Optional[TiffStrips]:
+        """Strip layout of a compressed TIFF with more than one interleaved strip"""
+        if image.format != 'TIFF' or [tile[0] for tile in image.tile] != ['libtiff']:
+            return None
+        tags = image.tag_v2
+        offsets, byte_counts = tags.get(273), tags.get(279)
+        if 322 in tags or tags.get(284, 1) != 1 or not isinstance(offsets, tuple) or len(offsets) < 2:
+            return None
+        decode_tags = {tag: (tags[tag], tags.tagtype.get(tag)) for tag in STRIP_DECODE_TAGS if tag in tags}
+        return TiffStrips(int(tags.get(278, image.height)), offsets, byte_counts, decode_tags)
+
+    def _strips_decode(self) -> bool:
+        """Check that the first strip decodes on its own to the file's mode and width"""
+        try:
+            band = self._read_strips(0, 1)
+        except Exception:
+            return False
+        return band.mode == self.mode and band.size == (self.size[0], 1)
+
+    def _strip_header(self, height: int, byte_counts: List[int]) -> bytes:
+        """TIFF header and directory for height rows stored as strips of byte_counts, data following"""
+        directory = TiffImagePlugin.ImageFileDirectory_v2(prefix=b'II')
+        for tag, (value, tag_type) in self._strips.tags.items():
+            directory[tag] = value
+            if tag_type is not None:
+                directory.tagtype[tag] = tag_type
+        directory[257] = height
+        directory[278] = self._strips.rows_per_strip
+        directory[279] = tuple(byte_counts)
+        # Relative to the end of the directory, where tobytes moves them
+        directory[273] = tuple(sum(byte_counts[:index]) for index in range(len(byte_counts)))
+        for tag in (257, 273, 278, 279):
+            directory.tagtype[tag] = TiffTags.LONG
+        return b'II*\x00' + struct.pack('<I', 8) + directory.tobytes(8)
+
+    def _read_strips(self, top: int, bottom: int) -> Image.Image:
+        """Decode the compressed strips covering rows [top, bottom) and crop them to the band"""
+        rows_per_strip = self._strips.rows_per_strip
+        first, last = top // rows_per_strip, (bottom - 1) // rows_per_strip + 1
+        strips_top, strips_bottom = first * rows_per_strip, min(self.size[1], last * rows_per_strip)
+        data = []
+        with open(self.file_path, 'rb') as f:
+            for index in range(first, last):
+                f.seek(self._strips.offsets[index])
+                data.append(f.read(self._strips.byte_counts[index]))
+        header = self._strip_header(strips_bottom - strips_top, [len(chunk) for chunk in data])
+        with Image.open(io.BytesIO(header + b''.join(data))) as strips:
+            strips.load()
+            return strips.crop((0, top - strips_top, self.size[0], bottom - strips_top))
+
+    def read(self, top: int, bottom: int) -> Image.Image:
+        """Return rows [top, bottom) as an image"""
+        width = self.size[0]
+        if self._strips is not None:
+            return self._read_strips(top, bottom)
+        if not self.streaming:
+            if self._image is None:
+                self._image = Image.open(self.file_path)
+                self._image.load()
+            return self._image.crop((0, top, width, bottom))
+
+        band = Image.new(self.mode, (width, bottom - top))
+        with open(self.file_path, 'rb') as f:
+            for (x0, y0, x1, y1), offset, rawmode, stride, orientation in self._tiles:
+                start, end = max(top, y0), min(bottom, y1)
+                if start >= end:
+                    continue
+                if orientation < 0:
+                    f.seek(offset + (y1 - end) * stride)
+                else:
+                    f.seek(offset + (start - y0) * stride)
+                data = f.read((end - start) * stride)
+                rows = Image.frombuffer(
+                    self.mode, (x1 - x0, end - start), data, 'raw', rawmode, stride, orientation
+                )
+                band.paste(rows, (x0, start - top))
+        if self._palette:
+            band.putpalette(self._palette)
+        return band
+
+class TiffStreamWriter:
+    """Writes an uncompressed baseline TIFF one band of rows at a time"""
+
+    PHOTOMETRIC = {'L': 1, 'LA': 1, 'RGB': 2, 'RGBA': 2}
+
+    def __init__(self, file_path: str, size: Tuple[int, int], mode: str, rows_per_strip: int):
+        if mode not in self.PHOTOMETRIC:
+            raise ValueError(f"Streaming TIFF output does not support mode {mode}")
+        width, height = size
+        samples = len(mode)
+        row_bytes = width * samples
+        strip_count = (height + rows_per_strip - 1) // rows_per_strip
+
+        entries = 11 if mode in ('LA', 'RGBA') else 10
+        ifd_size = 2 + entries * 12 + 4
+        extra_offset = 8 + ifd_size
+        bits_offset = extra_offset
+        offsets_offset = bits_offset + (2 * samples if samples > 2 else 0)
+        counts_offset = offsets_offset + (4 * strip_count if strip_count > 1 else 0)
+        data_offset = counts_offset + (4 * strip_count if strip_count > 1 else 0)
+        if data_offset + row_bytes * height > 0xFFFFFFFF:
+            raise ValueError("Image is too large for a classic TIFF; use PNG output")
+
+        strip_offsets = [data_offset + index * rows_per_strip * row_bytes for index in range(strip_count)]
+        strip_counts = [min(rows_per_strip, height - index * rows_per_strip) * row_bytes
+                        for index in range(strip_count)]
+
+        def short(tag, value):
+            return struct.pack('<HHIHxx', tag, 3, 1, value)
+
+        def long(tag, value):
+            return struct.pack('<HHII', tag, 4, 1, value)
+
+        def longs(tag, values, offset):
+            return long(tag, values[0]) if len(values) == 1 else struct.pack('<HHII', tag, 4, len(values), offset)
+
+        if samples == 1:
+            bits = short(258, 8)
+        elif samples == 2:
+            bits = struct.pack('<HHIHH', 258, 3, 2, 8, 8)
+        else:
+            bits = struct.pack('<HHII', 258, 3, samples, bits_offset)
+
+        ifd = [
+            long(256, width),
+            long(257, height),
+            bits,
+            short(259, 1),
+            short(262, self.PHOTOMETRIC[mode]),
+            longs(273, strip_offsets, offsets_offset),
+            short(277, samples),
+            long(278, rows_per_strip),
+            longs(279, strip_counts, counts_offset),
+            short(284, 1)
+        ]
+        if mode in ('LA', 'RGBA'):
+            ifd.append(short(338, 2))  # Unassociated alpha
+
+        self._file = open(file_path, 'wb')
+        self._file.write(b'II' + struct.pack('<HI', 42, 8))
+        self._file.write(struct.pack('<H', len(ifd)) + b''.join(ifd) + struct.pack('<I', 0))
+        if samples > 2:
+            self._file.write(struct.pack(f'<{samples}H', *([8] * samples)))
+        if strip_count > 1:
+            self._file.write(struct.pack(f'<{strip_count}I', *strip_offsets))
+            self._file.write(struct.pack(f'<{strip_count}I', *strip_counts))
+
+    def write(self, band: Image.Image):
+        self._file.write(band.tobytes())
+
+    def close(self):
+        self._file.close()
+
+class PngStreamWriter:
+    """Writes a PNG one band of rows at a time through an incremental zlib stream"""
+
+    COLOR_TYPES = {'L': 0, 'LA': 4, 'RGB': 2, 'RGBA': 6}
+
+    def __init__(self, file_path: str, size: Tuple[int, int], mode: str, rows_per_strip: int):
+        if mode not in self.COLOR_TYPES:
+            raise ValueError(f"Streaming PNG output does not support mode {mode}")
+        self._row_bytes = size[0] * len(mode)
+        self._compressor = zlib.compressobj(config.TILED_SETTINGS['png_compress_level'])
+        self._file = open(file_path, 'wb')
+        self._file.write(b'\x89PNG\r\n\x1a\n')
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', size[0], size[1], 8, self.COLOR_TYPES[mode], 0, 0, 0))
+
+    def _chunk(self, chunk_type: bytes, data: bytes):
+        self._file.write(struct.pack('>I', len(data)) + chunk_type + data)
+        self._file.write(struct.pack('>I', zlib.crc32(chunk_type + data) & 0xFFFFFFFF))
+
+    def write(self, band: Image.Image):
+        data = band.tobytes()
+        # Each scanline is prefixed with filter type 0 (none)
+        rows = b''.join(
+            b'\x00' + data[start:start + self._row_bytes]
+            for start in range(0, len(data), self._row_bytes)
+        )
+        compressed = self._compressor.compress(rows)
+        if compressed:
+            self._chunk(b'IDAT', compressed)
+
+    def close(self):
+        self._chunk(b'IDAT', self._compressor.flush())
+        self._chunk(b'IEND', b'')
+        self._file.close()
+
+STREAM_WRITERS = {
+    '.tif': TiffStreamWriter,
+    '.tiff': TiffStreamWriter,
+    '.png': PngStreamWriter
+}
+
+def open_stream_writer(file_path: str, size: Tuple[int, int], mode: str, rows_per_strip: int):
+    """Create a band writer chosen by the output file extension"""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in STREAM_WRITERS:
+        raise ValueError(
+            f"Tiled output must be one of {', '.join(sorted(STREAM_WRITERS))}, not '{extension}'"
+        )
+    return STREAM_WRITERS[extension](file_path, size, mode, rows_per_strip)
@@ -0,0 +1,139 @@
+import hashlib
+import itertools
+import os
+import queue
+import threading
+from pathlib import Path
+from PIL import Image, PngImagePlugin
+from typing import Callable, Iterable, Optional, Tuple
+from services.image_operations import ImageOperations
+import config
+
+class ThumbnailCache:
+    """
+    On-disk thumbnail cache in the style of the freedesktop.org thumbnail spec.
+
+    Each thumbnail is a PNG named after the MD5 of the source file's URI and
+    carries the source's Thumb::URI, Thumb::MTime and Thumb::Size, so a changed
+    file is detected without keeping an index. Files are written to a temporary
+    name and renamed into place, so concurrent editors never read a partial PNG.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, size: Optional[int] = None):
+        settings = config.THUMBNAIL_SETTINGS
+        self.size = size or settings['size']
+        self.cache_dir = cache_dir or settings['cache_dir'] or self.default_cache_dir()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def default_cache_dir() -> str:
+        """$XDG_CACHE_HOME/parametria/thumbnails, falling back to ~/.cache"""
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(base, 'parametria', 'thumbnails')
+
+    @staticmethod
+    def source_uri(file_path: str) -> str:
+        return Path(os.path.abspath(file_path)).as_uri()
+
+    def thumbnail_path(self, file_path: str) -> str:
+        digest = hashlib.md5(self.source_uri(file_path).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.png")
+
+    def get(self, file_path: str) -> Optional[Image.Image]:
+        """Return the cached thumbnail if it matches the file's current mtime and size"""
+        return self._open(file_path, decode=True)
+
+    def is_current(self, file_path: str) -> bool:
+        """Check for an up-to-date thumbnail by reading only its header"""
+        return self._open(file_path, decode=False) is not None
+
+    def _open(self, file_path: str, decode: bool):
+        try:
+            stat = os.stat(file_path)
+            with Image.open(self.thumbnail_path(file_path)) as thumbnail:
+                # Text chunks precede the pixel data, so open() has already read them
+                info = thumbnail.info
+                if (info.get('Thumb::MTime') != str(int(stat.st_mtime))
+                        or info.get('Thumb::Size') != str(stat.st_size)):
+                    return None
+                if decode:
+                    thumbnail.load()
+                return thumbnail
+        except (OSError, SyntaxError):
+            return None
+
+    def generate(self, file_path: str) -> Image.Image:
+        """Decode file_path at thumbnail size and store the result"""
+        stat = os.stat(file_path)
+        image = ImageOperations.load_image(file_path, (self.size, self.size))
+        image = ImageOperations.editable(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+        image = ImageOperations.fit_within(image, (self.size, self.size))
+
+        metadata = PngImagePlugin.PngInfo()
+        metadata.add_text('Thumb::URI', self.source_uri(file_path))
+        metadata.add_text('Thumb::MTime', str(int(stat.st_mtime)))
+        metadata.add_text('Thumb::Size', str(stat.st_size))
+        target = self.thumbnail_path(file_path)
+        temporary = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            image.save(temporary, 'PNG', pnginfo=metadata, compress_level=1)
+            os.replace(temporary, target)
+        except OSError:
+            # A read-only or full cache still yields a thumbnail, just not a stored one
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        return image
+
+    def load(self, file_path: str) -> Image.Image:
+        """Cached thumbnail, generating it on a miss"""
+        return self.get(file_path) or self.generate(file_path)
+
+class ThumbnailGenerator:
+    """
+    Produces thumbnails on a pool of worker threads.
+
+    Requests carry a priority (lower first), so the thumbnails a user is
+    looking at can jump ahead of a background pass over the whole folder.
+    Delivered results and errors go to callback(path, thumbnail, error) on a
+    worker thread; undelivered requests only make sure the disk cache is filled.
+    """
+
+    def __init__(self, callback: Callable[[str, Optional[Image.Image], Optional[Exception]], None],
+                 cache: Optional[ThumbnailCache] = None, workers: Optional[int] = None):
+        self.cache = cache or ThumbnailCache()
+        self.callback = callback
+        self._queue: 'queue.PriorityQueue[Tuple[int, int, Optional[str], bool]]' = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        worker_count = workers or config.THUMBNAIL_SETTINGS['workers'] or os.cpu_count() or 1
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"thumbnail-{index}", daemon=True)
+            for index in range(worker_count)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def request(self, paths: Iterable[str], priority: int = 1, deliver: bool = True):
+        """Queue paths, lower priorities first; deliver=False only fills the cache"""
+        for path in paths:
+            self._queue.put((priority, next(self._sequence), path, deliver))
+
+    def stop(self):
+        """Stop the workers after the item each is working on"""
+        for _ in self._threads:
+            self._queue.put((-1, next(self._sequence), None, False))
+
+    def _worker(self):
+        while True:
+            _, _, path, deliver = self._queue.get()
+            if path is None:
+                return
+            if not deliver and self.cache.is_current(path):
+                continue
+            try:
+                thumbnail, error = self.cache.load(path), None
+            except Exception as e:
+                thumbnail, error = None, e
+            if deliver:
+                self.callback(path, thumbnail, error)
@@ -0,0 +1,137 @@
+import math
+import os
+import warnings
+from PIL import Image
+from typing import Dict, Optional, Tuple
+from models.edit_pipeline import DEFAULT_PARAMS
+from services.blur_engine import BlurEngine
+from services.enhancement_kernel import EnhancementKernel
+from services.image_operations import ImageOperations
+from services.resize_engine import FILTER_SUPPORT, ResizeEngine, ResizePlan
+from services.streaming_io import BandReader, open_stream_writer
+import config
+
+class TiledProcessor:
+    """
+    Applies an edit recipe to an image file in horizontal bands.
+
+    Each band is read with enough overlapping rows for the resize filter and the
+    blur to see the same neighbours as a whole-image render, processed, trimmed
+    and appended to a streaming TIFF/PNG writer, so peak memory is bounded by the
+    band size rather than the image size. Resizes follow the same ResizePlan as
+    a whole-image render, with source bands starting on whole reduce blocks.
+    Each band's resample box is offset in floating point, so resized samples
+    can differ from a whole-image render by rounding (a level or two); with
+    alpha, the colour of nearly transparent pixels can differ by more, since
+    it is divided back out of the premultiplied values. The 'downsample'
+    blur's reduce grid depends on where a band starts, so bands use the
+    full-resolution 'box' blur instead. Contrast needs the mean of the whole
+    image, which a first pass accumulates band by band from histograms.
+
+    Sources BandReader cannot read in bands (PNG, JPEG, tiled TIFF) are decoded
+    in full with a warning, or fail when TILED_SETTINGS['full_decode'] is off.
+    """
+
+    def __init__(self, recipe: Dict, band_height: Optional[int] = None):
+        self.recipe = {**DEFAULT_PARAMS, **recipe}
+        self.band_height = band_height or config.TILED_SETTINGS['band_height']
+
+    def process(self, input_path: str, output_path: str) -> Tuple[int, int]:
+        """Process input_path into output_path and return the output size"""
+        reader = BandReader(input_path)
+        if not reader.streaming:
+            message = (f"{os.path.basename(input_path)} ({reader.format}) cannot be read in bands "
+                       "and must be decoded in full")
+            if not config.TILED_SETTINGS['full_decode']:
+                raise ValueError(message)
+            warnings.warn(message + ", so its memory use is not bounded", stacklevel=2)
+        plan = None
+        if self.recipe['resize']:
+            plan = ResizeEngine.plan(reader.size, self.recipe['resize'], self.recipe['resize_mode'],
+                                     self.recipe['resize_filter'])
+            if plan.is_identity(reader.size):
+                plan = None
+        width, height = plan.size if plan else reader.size
+        blur_method = self.blur_method()
+        halo = BlurEngine.halo(self.recipe['blur'], blur_method)
+
+        mean = None
+        if self.recipe['contrast'] != 1.0:
+            mean = self._image_mean(reader, plan, height)
+
+        writer = None
+        try:
+            for top in range(0, height, self.band_height):
+                bottom = min(top + self.band_height, height)
+                context_top, context_bottom = max(0, top - halo), min(height, bottom + halo)
+
+                band = self._prepare_rows(reader, plan, context_top, context_bottom)
+                band = self._adjust_tone(band, mean)
+                band = ImageOperations.apply_blur(band, self.recipe['blur'], blur_method)
+                band = band.crop((0, top - context_top, width, bottom - context_top))
+
+                if writer is None:
+                    writer = open_stream_writer(output_path, (width, height), band.mode, self.band_height)
+                writer.write(band)
+        finally:
+            if writer is not None:
+                writer.close()
+        return width, height
+
+    def blur_method(self) -> str:
+        """The recipe's blur method, with 'downsample' replaced by 'box' since bands cannot share its grid"""
+        method = self.recipe['blur_method'] or config.BLUR_SETTINGS['export_method']
+        return 'box' if method == 'downsample' else method
+
+    def _prepare_rows(self, reader: BandReader, plan: Optional[ResizePlan],
+                      top: int, bottom: int) -> Image.Image:
+        """Produce rows [top, bottom) of the resized, grayscale-converted image"""
+        if plan is None:
+            band = reader.read(top, bottom)
+        else:
+            band = self._resize_rows(reader, plan, top, bottom)
+        band = ImageOperations.editable(band)
+        if self.recipe['grayscale']:
+            band = ImageOperations.convert_to_grayscale(band)
+        return band
+
+    def _resize_rows(self, reader: BandReader, plan: ResizePlan, top: int, bottom: int) -> Image.Image:
+        """Rows [top, bottom) of the resized image, from the source rows the filter reaches"""
+        factor_x, factor_y = plan.factors
+        reduce_left, reduce_top, reduce_right, reduce_bottom = plan.reduce_box
+        box_left, box_top, box_right, box_bottom = plan.reduced_box
+        # Rows of the reduced image needed, then the whole reduce blocks they come from
+        reduced_height = math.ceil((reduce_bottom - reduce_top) / factor_y)
+        scale = (box_bottom - box_top) / plan.size[1]
+        support = FILTER_SUPPORT[plan.filter] * max(scale, 1.0)
+        first = max(0, math.floor(box_top + top * scale - support) - 1)
+        last = min(reduced_height, math.ceil(box_top + bottom * scale + support) + 1)
+        source_top = reduce_top + first * factor_y
+        source_bottom = min(reduce_bottom, reduce_top + last * factor_y)
+
+        band = ImageOperations.editable(reader.read(source_top, source_bottom))
+        return ResizeEngine.run(
+            band, (plan.size[0], bottom - top), plan.filter, plan.factors,
+            (reduce_left, 0, reduce_right, source_bottom - source_top),
+            (box_left, box_top + top * scale - first, box_right, box_top + bottom * scale - first)
+        )
+
+    def _image_mean(self, reader: BandReader, plan: Optional[ResizePlan], height: int) -> int:
+        """Grayscale mean of the image entering the tone stage, accumulated per band"""
+        histogram = [0] * 256
+        for top in range(0, height, self.band_height):
+            bottom = min(top + self.band_height, height)
+            band = self._prepare_rows(reader, plan, top, bottom)
+            gray = band if band.mode == 'L' else band.convert('L')
+            for value, count in enumerate(gray.histogram()):
+                histogram[value] += count
+        total = sum(histogram)
+        return int(sum(value * count for value, count in enumerate(histogram)) / total + 0.5)
+
+    def _adjust_tone(self, band: Image.Image, mean: Optional[int]) -> Image.Image:
+        contrast, brightness = self.recipe['contrast'], self.recipe['brightness']
+        if contrast == 1.0 and brightness == 1.0:
+            return band
+        if not EnhancementKernel.supports(band):
+            raise ValueError(f"Tiled processing does not support mode {band.mode}")
+        return EnhancementKernel.apply(band, contrast, brightness, mean=mean)
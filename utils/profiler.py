@@ -0,0 +1,179 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional
+import config
+
+class StageRecord(NamedTuple):
+    """One timed call: what ran, when, for how long and how many bytes it produced"""
+    name: str
+    start: float
+    seconds: float
+    bytes: int
+    thread: str
+
+def result_bytes(result: Any) -> int:
+    """Pixel bytes of a stage result (PIL image or Tk PhotoImage); 0 for anything else"""
+    if hasattr(result, 'getbands'):
+        return result.width * result.height * len(result.getbands())
+    if hasattr(result, 'width') and hasattr(result, 'height') and callable(result.width):
+        return result.width() * result.height() * 4
+    return 0
+
+class _Stage:
+    """Context manager that records its duration when profiling is on"""
+
+    __slots__ = ('name', 'start', 'bytes')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.bytes = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        Profiler.record(self.name, self.start, time.perf_counter() - self.start, self.bytes)
+        return False
+
+class _NullStage:
+    """Shared do-nothing stage used while profiling is off"""
+
+    __slots__ = ()
+    bytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+_NULL_STAGE = _NullStage()
+_enabled = bool(config.PROFILING_SETTINGS['enabled'] or os.environ.get('PARAMETRIA_PROFILE'))
+_records: Deque[StageRecord] = deque(maxlen=config.PROFILING_SETTINGS['capacity'])
+_records_lock = threading.Lock()
+_epoch = time.perf_counter()
+
+class Profiler:
+    """
+    Records wall time and result bytes of processing stages into a ring buffer.
+
+    Decorate functions with @Profiler.timed(name) or wrap blocks in
+    `with Profiler.stage(name):`. While disabled, both cost a flag check and
+    nothing is recorded. Records can be summarised for the on-screen overlay or
+    written as JSON or as a Chrome trace (open in chrome://tracing or Perfetto).
+    Bytes are the pixel size of a stage's result, not a heap measurement.
+    """
+
+    @staticmethod
+    def enabled() -> bool:
+        return _enabled
+
+    @staticmethod
+    def set_enabled(enabled: bool):
+        global _enabled
+        _enabled = enabled
+
+    @staticmethod
+    def record(name: str, start: float, seconds: float, nbytes: int = 0):
+        with _records_lock:
+            _records.append(StageRecord(name, start, seconds, nbytes, threading.current_thread().name))
+
+    @staticmethod
+    def stage(name: str):
+        """Context manager timing a block; set .bytes on it to record a size"""
+        return _Stage(name) if _enabled else _NULL_STAGE
+
+    @staticmethod
+    def timed(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+        """Decorator recording each call of the function under name"""
+        def decorate(fn: Callable) -> Callable:
+            stage_name = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not _enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                result = fn(*args, **kwargs)
+                Profiler.record(stage_name, start, time.perf_counter() - start, result_bytes(result))
+                return result
+            return wrapper
+        return decorate
+
+    @staticmethod
+    def records() -> List[StageRecord]:
+        with _records_lock:
+            return list(_records)
+
+    @staticmethod
+    def clear():
+        with _records_lock:
+            _records.clear()
+
+    @staticmethod
+    def summary(window: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """Per-stage count, total, mean and max seconds, optionally over the last window seconds"""
+        records = Profiler.records()
+        if window is not None:
+            cutoff = time.perf_counter() - window
+            records = [record for record in records if record.start >= cutoff]
+        stages: Dict[str, Dict[str, float]] = {}
+        for record in records:
+            stats = stages.setdefault(record.name, {'count': 0, 'total': 0.0, 'max': 0.0, 'bytes': 0})
+            stats['count'] += 1
+            stats['total'] += record.seconds
+            stats['max'] = max(stats['max'], record.seconds)
+            stats['bytes'] += record.bytes
+        for stats in stages.values():
+            stats['mean'] = stats['total'] / stats['count']
+        return stages
+
+    @staticmethod
+    def dump_json(file_path: str):
+        """Write the raw records and the per-stage summary as JSON"""
+        document = {
+            'records': [record._asdict() for record in Profiler.records()],
+            'summary': Profiler.summary()
+        }
+        with open(file_path, 'w') as f:
+            json.dump(document, f, indent=2)
+
+    @staticmethod
+    def dump_chrome_trace(file_path: str):
+        """Write the records in Chrome's Trace Event format (complete events, microseconds)"""
+        threads: Dict[str, int] = {}
+        events = []
+        for record in Profiler.records():
+            thread_id = threads.setdefault(record.thread, len(threads) + 1)
+            events.append({
+                'name': record.name,
+                'ph': 'X',
+                'ts': (record.start - _epoch) * 1e6,
+                'dur': record.seconds * 1e6,
+                'pid': 1,
+                'tid': thread_id,
+                'args': {'bytes': record.bytes}
+            })
+        for thread_name, thread_id in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': thread_id,
+                           'args': {'name': thread_name}})
+        with open(file_path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    @staticmethod
+    def dump(directory: Optional[str] = None) -> List[str]:
+        """Write both formats with a timestamped name and return their paths"""
+        directory = directory or config.PROFILING_SETTINGS['dump_dir']
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(directory, time.strftime('parametria-profile-%Y%m%d-%H%M%S'))
+        Profiler.dump_json(f"{stem}.json")
+        Profiler.dump_chrome_trace(f"{stem}.trace.json")
+        return [f"{stem}.json", f"{stem}.trace.json"]
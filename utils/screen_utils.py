@@ -1,24 +1,34 @@
-from typing import Tuple
+from typing import Optional, Tuple
 import config
 
 class ScreenUtils:
     """Utility class for screen and window operations"""
     
     @staticmethod
-    def get_optimal_window_size() -> Tuple[str, str]:
-        """Get optimal window size based on screen resolution"""
+    def window_size_for(screen_width: int, screen_height: int) -> Tuple[str, str]:
+        """Window size for a screen of the given size"""
+        divisor = config.WINDOW_SCREEN_DIVISOR
+        return str(int(screen_width / divisor)), str(int(screen_height / divisor))
+    
+    @staticmethod
+    def primary_monitor_size() -> Optional[Tuple[int, int]]:
+        """Size of the primary monitor from screeninfo, or None if it cannot be probed"""
         try:
             from screeninfo import get_monitors
-            w = ''
-            h = ''
-            for i in str(get_monitors()).split(' '):
-                if('width=' in i):
-                    w = str(int(int(i[6:-1])/1.4))
-                if('height=' in i):
-                    h = str(int(int(i[7:-1])/1.4))
-            if not w or not h:
-                w, h = str(config.DEFAULT_WINDOW_SIZE[0]), str(config.DEFAULT_WINDOW_SIZE[1])
-            return w, h
-        except ImportError:
+            monitors = get_monitors()
+        except Exception:
+            # screeninfo missing, or no display/xrandr to enumerate
+            return None
+        if not monitors:
+            return None
+        monitor = next((m for m in monitors if getattr(m, 'is_primary', False)), monitors[0])
+        return monitor.width, monitor.height
+    
+    @staticmethod
+    def get_optimal_window_size() -> Tuple[str, str]:
+        """Get optimal window size based on screen resolution"""
+        size = ScreenUtils.primary_monitor_size()
+        if size is None:
             # Default window size if screeninfo is not available
             return str(config.DEFAULT_WINDOW_SIZE[0]), str(config.DEFAULT_WINDOW_SIZE[1])
+        return ScreenUtils.window_size_for(*size)